@@ -23,3 +23,7 @@ class NotFoundError(ValueError):
 
 class Timeout(Exception):
     """Represent a missing resource."""
+
+
+class CircuitOpenError(RuntimeError):
+    """Report that requests are being refused after too many consecutive failures."""
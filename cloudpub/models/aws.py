@@ -1,7 +1,7 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 import logging
 import sys
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Type, Union
 
 if sys.version_info >= (3, 8):
     from typing import Literal, TypedDict  # pragma: no cover
@@ -16,6 +16,10 @@ from cloudpub.models.common import AttrsJSONDecodeMixin
 
 log = logging.getLogger(__name__)
 
+_SOURCE_TYPES = ["AmazonMachineImage", "CloudFormationTemplate"]
+_VALID_SOURCE_TYPES = frozenset(_SOURCE_TYPES)
+_INVALID_SOURCE_TYPE_MSG = f"Invalid value for type. Expected: {_SOURCE_TYPES}"
+
 
 @define
 class Version(AttrsJSONDecodeMixin):
@@ -161,7 +165,7 @@ class AmiDeliveryOptionsDetails(AttrsJSONDecodeMixin):
     """Recommended instance type of the AMI. IE m5.medium"""
 
     security_groups: List[SecurityGroup] = field(
-        converter=lambda x: [SecurityGroup.from_json(a) for a in x] if x else [],
+        converter=SecurityGroup.from_json_list,  # type: ignore
         on_setattr=NO_OP,
         metadata={"alias": "SecurityGroups"},
     )
@@ -224,7 +228,7 @@ class DeliveryOptionsRecommendations(AttrsJSONDecodeMixin):
     """Instance type for this recommendation"""
 
     security_groups: List[SecurityGroupRecommendations] = field(
-        converter=lambda x: [SecurityGroupRecommendations.from_json(a) for a in x] if x else [],
+        converter=SecurityGroupRecommendations.from_json_list,  # type: ignore
         on_setattr=NO_OP,
         metadata={"alias": "SecurityGroups"},
     )
@@ -310,7 +314,7 @@ class VersionMapping(AttrsJSONDecodeMixin):
     """Version object."""
 
     delivery_options: List[DeliveryOption] = field(
-        converter=lambda x: [DeliveryOption.from_json(a) for a in x] if x else [],
+        converter=DeliveryOption.from_json_list,  # type: ignore
         on_setattr=NO_OP,
         metadata={"alias": "DeliveryOptions"},
     )
@@ -468,9 +472,8 @@ class ProductVersionsBase(AttrsJSONDecodeMixin):
     @type.validator
     def valid_type(self, attribute: Attribute, value: Any) -> None:
         """Ensure the attribute ``type`` has an expected value."""
-        valid_values = ["AmazonMachineImage", "CloudFormationTemplate"]
-        if value not in valid_values:
-            raise ValueError(f"Invalid value for {attribute.name}. Expected: {valid_values}")
+        if value not in _VALID_SOURCE_TYPES:
+            raise ValueError(_INVALID_SOURCE_TYPE_MSG)
 
 
 @define
@@ -548,15 +551,25 @@ class ProductVersionsCloudFormationSource(ProductVersionsBase):
     """The CloudFormation's template."""
 
 
+_SOURCE_CLASSES: Dict[str, Type[ProductVersionsBase]] = {
+    "AmazonMachineImage": ProductVersionsVirtualizationSource,
+    "CloudFormationTemplate": ProductVersionsCloudFormationSource,
+}
+
+
 def convert_source(
     x: Any,
-) -> Union[ProductVersionsVirtualizationSource, ProductVersionsCloudFormationSource]:
+) -> Optional[Union[ProductVersionsVirtualizationSource, ProductVersionsCloudFormationSource]]:
     """Convert the incoming JSON into one of the suppported source element from :class:`~ProductVersionsResponse`."""  # noqa: E501
-    try:
-        return ProductVersionsVirtualizationSource.from_json(x)
-    except TypeError:
-        pass
-    return ProductVersionsCloudFormationSource.from_json(x)
+    # An empty source is converted to None, as the models' from_json does
+    if not x:
+        return None
+    ProductVersionsBase._assert_json_dict(x)
+    # The models accept both the alias and the attribute name
+    klass = _SOURCE_CLASSES.get(x.get("Type") or x.get("type"))
+    if not klass:
+        raise ValueError(_INVALID_SOURCE_TYPE_MSG)
+    return klass.from_json(x)
 
 
 @define
@@ -597,7 +610,7 @@ class ProductVersionsResponse(AttrsJSONDecodeMixin):
     """The linked sources for the current version."""
 
     delivery_options: List[DeliveryOption] = field(
-        converter=lambda x: [DeliveryOption.from_json(a) for a in x] if x else [],
+        converter=DeliveryOption.from_json_list,  # type: ignore
         on_setattr=NO_OP,
         metadata={"alias": "DeliveryOptions"},
     )
@@ -652,14 +665,14 @@ class PromotionalResources(AttrsJSONDecodeMixin):
     """The URL for the product's logo."""
 
     additional_resources: List[AdditionalResources] = field(
-        converter=lambda x: [AdditionalResources.from_json(a) for a in x] if x else [],
+        converter=AdditionalResources.from_json_list,  # type: ignore
         on_setattr=NO_OP,
         metadata={"alias": "AdditionalResources"},
     )
     """The product's additional resources."""
 
     videos: List[PromoResourcesVideo] = field(
-        converter=lambda x: [PromoResourcesVideo.from_json(a) for a in x] if x else [],
+        converter=PromoResourcesVideo.from_json_list,  # type: ignore
         on_setattr=NO_OP,
         metadata={"alias": "Videos"},
     )
@@ -771,7 +784,7 @@ class ProductDetailResponse(AttrsJSONDecodeMixin):
     """Represent the parsed elements from "Details" of :class:`~cloudpub.models.aws.DescribeEntityResponse`."""  # noqa: E501
 
     versions: List[ProductVersionsResponse] = field(
-        converter=lambda x: [ProductVersionsResponse.from_json(a) for a in x] if x else [],
+        converter=ProductVersionsResponse.from_json_list,  # type: ignore
         on_setattr=NO_OP,
         metadata={"alias": "Versions"},
     )
@@ -792,7 +805,7 @@ class ProductDetailResponse(AttrsJSONDecodeMixin):
     """The product's promotional resources."""
 
     dimensions: List[Dimensions] = field(
-        converter=lambda x: [Dimensions.from_json(a) for a in x] if x else [],
+        converter=Dimensions.from_json_list,  # type: ignore
         on_setattr=NO_OP,
         metadata={"alias": "Dimensions"},
     )
@@ -940,7 +953,7 @@ class ListEntitiesResponse(AttrsJSONDecodeMixin):
     """  # noqa: E501
 
     entity_summary_list: List[EntitySummary] = field(
-        converter=lambda x: [EntitySummary.from_json(a) for a in x] if x else [],  # type: ignore
+        converter=EntitySummary.from_json_list,  # type: ignore
         on_setattr=NO_OP,
         metadata={"alias": "EntitySummaryList"},
     )
@@ -995,7 +1008,7 @@ class ChangeSummary(AttrsJSONDecodeMixin):
     """This object contains details specific to the change type of the requested change."""
 
     error_details: List[ErrorDetail] = field(
-        converter=lambda x: [ErrorDetail.from_json(a) for a in x] if x else [],  # type: ignore
+        converter=ErrorDetail.from_json_list,  # type: ignore
         on_setattr=NO_OP,
         metadata={"alias": "ErrorDetailList"},
     )
@@ -1066,7 +1079,7 @@ class DescribeChangeSetReponse(AttrsJSONDecodeMixin):
     """Returned if there is a failure on the change set, but that failure is not related to any of the changes in the request."""  # noqa: E501
 
     change_set: List[ChangeSummary] = field(
-        converter=lambda x: [ChangeSummary.from_json(a) for a in x] if x else [],  # type: ignore
+        converter=ChangeSummary.from_json_list,  # type: ignore
         on_setattr=NO_OP,
         metadata={"alias": "ChangeSet"},
     )
@@ -1148,7 +1161,7 @@ class ListChangeSetsResponse(AttrsJSONDecodeMixin):
     """The describe_entity response's metadata."""
 
     change_set_list: List[ListChangeSet] = field(
-        converter=lambda x: [ListChangeSet.from_json(a) for a in x] if x else [],  # type: ignore
+        converter=ListChangeSet.from_json_list,  # type: ignore
         on_setattr=NO_OP,
         metadata={"alias": "ChangeSetSummaryList"},
     )
@@ -1,13 +1,39 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 import logging
 from copy import deepcopy
-from typing import Any, Dict, Tuple
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Tuple
 
 from attrs import Attribute, asdict, define
 
 log = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _attr_names(cls: type) -> Tuple[str, ...]:
+    """Return the names of the attributes of an attrs decorated class."""
+    attributes: Tuple[Attribute] = cls.__attrs_attrs__  # type: ignore
+    return tuple(a.name for a in attributes if isinstance(a, Attribute))
+
+
+@lru_cache(maxsize=None)
+def _attr_overrides(cls: type) -> Tuple[Tuple[str, Any, Any, Any], ...]:
+    """Return the name, alias, default and constant of the attributes which set any of them."""
+    attributes: Tuple[Attribute] = cls.__attrs_attrs__  # type: ignore
+    overrides = (
+        (at.name, at.metadata.get("alias"), at.metadata.get("default"), at.metadata.get("const"))
+        for at in attributes
+    )
+    return tuple(o for o in overrides if any(o[1:]))
+
+
+@lru_cache(maxsize=None)
+def _hide_unset_names(cls: type) -> FrozenSet[str]:
+    """Return the names of the attributes which must be omitted from JSON when unset."""
+    attributes: Tuple[Attribute] = cls.__attrs_attrs__  # type: ignore
+    return frozenset(at.name for at in attributes if at.metadata.get("hide_unset", False))
+
+
 @define
 class AttrsJSONDecodeMixin:
     """Implement the default JSON (de)serialization for attrs decorated classes."""
@@ -62,29 +88,22 @@ class AttrsJSONDecodeMixin:
         json_copy = deepcopy(json)
 
         # Resolve the aliases in JSON to avoid breaking the class construction
-        attributes: Tuple[Attribute] = cls.__attrs_attrs__  # type: ignore
-        for at in attributes:
-            alias = at.metadata.get("alias")
+        for name, alias, default, constant in _attr_overrides(cls):  # type: ignore
             if alias:
                 alias_value = json_copy.pop(alias, None)
                 if alias_value is not None:
-                    json_copy[at.name] = alias_value
+                    json_copy[name] = alias_value
             # Add defaults to unset attributes when required
-            default = at.metadata.get("default")
-            if default and not json_copy.get(at.name):
-                json_copy[at.name] = default
+            if default and not json_copy.get(name):
+                json_copy[name] = default
             # If a constant is set we need to override the value coming from JSON
-            constant = at.metadata.get("const")
             if constant:
-                json_copy[at.name] = constant
+                json_copy[name] = constant
 
         # Run the preprocessing if any
         json_copy = cls._preprocess_json(json_copy)
 
-        args = {}
-        cls_attr = [a.name for a in cls.__attrs_attrs__ if isinstance(a, Attribute)]  # type: ignore
-        for a in cls_attr:
-            args[a] = json_copy.pop(a, None)
+        args = {a: json_copy.pop(a, None) for a in _attr_names(cls)}  # type: ignore
 
         # Log any unused attributes
         for k in json_copy.keys():
@@ -92,6 +111,22 @@ class AttrsJSONDecodeMixin:
 
         return cls(**args)
 
+    @classmethod
+    def from_json_list(cls, json: Any) -> List[Any]:
+        """
+        Convert a list of JSON dictionaries into a list of class objects.
+
+        Args:
+            json (list)
+                A list of JSON containing the attrs class keys.
+        Returns:
+            list: The converted objects, or an empty list when no JSON is given.
+        """
+        if not json:
+            return []
+        from_json = cls.from_json
+        return [from_json(x) for x in json]
+
     @staticmethod
     def _serialize_value(attribute: Attribute, value: Any) -> Any:
         """Iteractively parse and serialize the received value to a Python builtin.
@@ -130,10 +165,11 @@ class AttrsJSONDecodeMixin:
                 setattr(self_copy, at.name, value)
 
         # Convert the instance to dictionary
+        hide_unset = _hide_unset_names(type(self))
         json = asdict(
             self_copy,
             recurse=False,
-            filter=lambda k, v: not (k.metadata.get("hide_unset", False) and v is None),
+            filter=lambda k, v: v is not None or k.name not in hide_unset,
         )
 
         # Resolve back the aliases
@@ -103,7 +103,11 @@ class AzureService(BaseService[AzurePublishingMetadata]):
         Returns:
             The job ID to track its status alongside the initial status.
         """
-        log.debug("Received the following data to create/modify: %s" % json.dumps(data, indent=2))
+        # Avoid serializing the potentially large data when it's not going to be logged
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(
+                "Received the following data to create/modify: %s", json.dumps(data, indent=2)
+            )
         resp = self.session.post(path="configure", json=data)
         self._raise_for_status(response=resp)
         rsp_data = resp.json()
@@ -121,7 +125,7 @@ class AzureService(BaseService[AzurePublishingMetadata]):
         Returns:
             The updated job status.
         """
-        log.debug(f"Query job details for \"{job_id}\"")
+        log.debug("Query job details for \"%s\"", job_id)
         resp = self.session.get(path=f"configure/{job_id}/status")
 
         # We don't want to fail if there's a server error thus we make a fake
@@ -177,7 +181,7 @@ class AzureService(BaseService[AzurePublishingMetadata]):
             error_message = f"Job {job_id} failed: \n{job_details.errors}"
             self._raise_error(InvalidStateError, error_message)
         elif job_details.job_result == "succeeded":
-            log.debug(f"Job {job_id} succeeded")
+            log.debug("Job %s succeeded", job_id)
         return job_details
 
     def configure(self, resource: AzureResource) -> ConfigureStatus:
@@ -194,7 +198,8 @@ class AzureService(BaseService[AzurePublishingMetadata]):
             "$schema": self.CONFIGURE_SCHEMA.format(AZURE_API_VERSION=self.AZURE_API_VERSION),
             "resources": [resource.to_json()],
         }
-        log.info("Data to configure: %s", json.dumps(data, indent=2))
+        if log.isEnabledFor(logging.INFO):
+            log.info("Data to configure: %s", json.dumps(data, indent=2))
         res = self._configure(data=data)
         return self._wait_for_job_completion(job_id=res.job_id)
 
@@ -540,9 +545,7 @@ class AzureService(BaseService[AzurePublishingMetadata]):
             self.filter_product_resources(product=product, resource="submission"),
         )[0]
         if not self._is_submission_in_preview(submission):
-            log.info(
-                "Submitting the product \"%s (%s)\" to \"preview\"." % (product_name, product.id)
-            )
+            log.info("Submitting the product \"%s (%s)\" to \"preview\".", product_name, product.id)
             res = self.submit_to_status(product_id=product.id, status='preview')
 
             if res.job_result != 'succeeded' or not self.get_submission_state(
@@ -572,7 +575,7 @@ class AzureService(BaseService[AzurePublishingMetadata]):
         """
         # Note: the offer can only go `live` after successfully being changed to `preview`
         # which takes up to 4 days.
-        log.info("Submitting the product \"%s (%s)\" to \"live\"." % (product_name, product.id))
+        log.info("Submitting the product \"%s (%s)\" to \"live\".", product_name, product.id)
         res = self.submit_to_status(product_id=product.id, status='live')
 
         if res.job_result != 'succeeded' or not self.get_submission_state(product.id, state="live"):
@@ -598,16 +601,17 @@ class AzureService(BaseService[AzurePublishingMetadata]):
         plan_name = metadata.destination.split("/")[-1]
         product, plan = self.get_product_plan_by_name(product_name, plan_name)
         log.info(
-            "Preparing to associate the image with the plan \"%s\" from product \"%s\""
-            % (product_name, plan_name)
+            "Preparing to associate the image with the plan \"%s\" from product \"%s\"",
+            product_name,
+            plan_name,
         )
 
         # 2. Retrieve the VM Technical configuration for the given plan
-        log.debug("Retrieving the technical config for \"%s\"." % metadata.destination)
+        log.debug("Retrieving the technical config for \"%s\".", metadata.destination)
         tech_config = self.get_plan_tech_config(product, plan)
 
         # 3. Prepare the Disk Version
-        log.debug("Creating the VMImageResource with SAS: \"%s\"" % metadata.image_path)
+        log.debug("Creating the VMImageResource with SAS: \"%s\"", metadata.image_path)
         sas = OSDiskURI(uri=metadata.image_path)
         source = VMImageSource(source_type="sasUri", os_disk=sas.to_json(), data_disks=[])
 
@@ -623,14 +627,15 @@ class AzureService(BaseService[AzurePublishingMetadata]):
         elif not is_sas_present(tech_config, metadata.image_path):
             # Here we can have the metadata.disk_version set or empty.
             # When set we want to get the existing disk_version which matches its value.
-            log.debug("Scanning the disk versions from %s" % metadata.destination)
+            log.debug("Scanning the disk versions from %s", metadata.destination)
             disk_version = seek_disk_version(tech_config, metadata.disk_version)
 
             # Check the images of the selected DiskVersion if it exists
             if disk_version:
                 log.debug(
-                    "DiskVersion \"%s\" exists in \"%s\"."
-                    % (disk_version.version_number, metadata.destination)
+                    "DiskVersion \"%s\" exists in \"%s\".",
+                    disk_version.version_number,
+                    metadata.destination,
                 )
                 disk_version = set_new_sas_disk_version(disk_version, metadata, source)
 
@@ -640,20 +645,21 @@ class AzureService(BaseService[AzurePublishingMetadata]):
                 tech_config.disk_versions.append(disk_version)
         else:
             log.info(
-                "The destination \"%s\" already contains the SAS URI: \"%s\"."
-                % (metadata.destination, metadata.image_path)
+                "The destination \"%s\" already contains the SAS URI: \"%s\".",
+                metadata.destination,
+                metadata.image_path,
             )
 
         # 4. With the updated disk_version we should adjust the SKUs and submit the changes
         if disk_version:
-            log.debug("Updating SKUs for \"%s\"." % metadata.destination)
+            log.debug("Updating SKUs for \"%s\".", metadata.destination)
             tech_config.skus = update_skus(
                 disk_versions=tech_config.disk_versions,
                 generation=metadata.generation,
                 plan_name=plan_name,
                 old_skus=tech_config.skus,
             )
-            log.debug("Updating the technical configuration for \"%s\"." % metadata.destination)
+            log.debug("Updating the technical configuration for \"%s\".", metadata.destination)
             self.configure(resource=tech_config)
 
         # 5. Proceed to publishing if it was requested.
@@ -1,11 +1,15 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 import logging
+import random
+import threading
+import time
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Collection, Dict, Optional
 
 import requests
 from requests.adapters import HTTPAdapter, Retry
 
+from cloudpub.error import CircuitOpenError
 from cloudpub.utils import base_url, join_url
 
 log = logging.getLogger(__name__)
@@ -14,23 +18,169 @@ log = logging.getLogger(__name__)
 class AccessToken:
     """Represent the Microsoft API Authorization token."""
 
-    def __init__(self, json: Dict[str, str]):
+    def __init__(self, json: Dict[str, str], skew: int = 60):
         """
         Create a new AccessToken object.
 
         Args:
             json (dict)
                 The login response with from Microsoft.
+            skew (int, optional)
+                Seconds before the expiration date to consider the token as expired.
+                Defaults to ``60``.
         """
-        self.expires_on = datetime.fromtimestamp(int(json["expires_on"]))
+        self.expires_ts: float = int(json["expires_on"])
         self.access_token = json["access_token"]
-        log.debug(f"Obtained token with expiration date on {self.expires_on}")
+        self.skew = skew
+        log.debug("Obtained token with expiration date on %s", self.expires_on)
+
+    @property
+    def expires_on(self) -> datetime:
+        """The token expiration date."""
+        return datetime.fromtimestamp(self.expires_ts)
+
+    @expires_on.setter
+    def expires_on(self, value: datetime) -> None:
+        self.expires_ts = value.timestamp()
 
     def is_expired(self) -> bool:
-        """Return True if the token is expired and False otherwise."""
-        if datetime.now() > self.expires_on:
+        """Return True if the token is expired (or about to expire) and False otherwise."""
+        return time.time() > self.expires_ts - self.skew
+
+
+class JitterRetry(Retry):
+    """Retry policy which adds a random jitter to the backoff time between retries."""
+
+    def __init__(
+        self,
+        *args,
+        jitter: float = 0.0,
+        throttled_methods: Optional[Collection[str]] = None,
+        **kwargs,
+    ) -> None:
+        """
+        Create a new JitterRetry object.
+
+        Args:
+            jitter (float, optional)
+                The maximum amount of random seconds to add to each backoff.
+                Defaults to ``0.0``.
+            throttled_methods (collection, optional)
+                Methods which are not in ``allowed_methods`` but may still be retried when
+                the server answers ``429 Too Many Requests``, as the request was not processed.
+                Defaults to no methods.
+            *args, **kwargs
+                Arguments for :class:`urllib3.util.Retry`.
+        """
+        super().__init__(*args, **kwargs)
+        self.jitter = jitter
+        self.throttled_methods = frozenset(throttled_methods or ())
+
+    def new(self, **kwargs) -> "JitterRetry":
+        """Return a new JitterRetry object preserving the backoff jitter and throttled methods."""
+        retry = super().new(**kwargs)
+        retry.jitter = self.jitter
+        retry.throttled_methods = self.throttled_methods
+        return retry
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        """Return True when the request must be retried for the given response status."""
+        if status_code == 429 and method.upper() in self.throttled_methods:
+            return True
+        return super().is_retry(method, status_code, has_retry_after=has_retry_after)
+
+    def get_backoff_time(self) -> float:
+        """Return the backoff time with a random jitter to avoid synchronized retries."""
+        backoff = super().get_backoff_time()
+        if backoff <= 0 or self.jitter <= 0:
+            return backoff
+        return backoff + random.uniform(0, self.jitter)  # nosec B311
+
+
+class TimeoutAdapter(HTTPAdapter):
+    """HTTPAdapter which sets a default timeout for requests without one."""
+
+    def __init__(self, *args, timeout: float = 30, **kwargs) -> None:
+        """
+        Create a new TimeoutAdapter object.
+
+        Args:
+            timeout (float, optional)
+                The default timeout in seconds for each request. Defaults to ``30``.
+            *args, **kwargs
+                Arguments for :class:`requests.adapters.HTTPAdapter`.
+        """
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        """Send the request using the default timeout when not set."""
+        if timeout is None:
+            timeout = self.timeout
+        return super().send(
+            request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies
+        )
+
+
+class CircuitBreaker:
+    """
+    Refuse requests for a while after too many consecutive failures.
+
+    The circuit is ``closed`` while requests succeed and becomes ``open`` after
+    ``threshold`` consecutive failures, refusing new requests. After ``reset_seconds``
+    it becomes ``half-open``, letting a single probe request through while refusing the
+    others: a success closes it again while a failure opens it for another ``reset_seconds``.
+    If the probe result is never recorded another probe is allowed after ``reset_seconds``.
+    """
+
+    def __init__(self, threshold: int = 5, reset_seconds: float = 30) -> None:
+        """
+        Create a new CircuitBreaker object.
+
+        Args:
+            threshold (int, optional)
+                The number of consecutive failures to open the circuit. Defaults to ``5``.
+            reset_seconds (float, optional)
+                The seconds to wait before allowing new requests. Defaults to ``30``.
+        """
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.fail_count = 0
+        self.opened_at = 0.0
+        self.state = "closed"
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return True when a request is allowed and False otherwise."""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if time.monotonic() - self.opened_at < self.reset_seconds:
+                return False
+            # Let a single probe through until its result is recorded
+            self.state = "half-open"
+            self.opened_at = time.monotonic()
             return True
-        return False
+
+    def record(self, success: bool) -> None:
+        """
+        Record the result of a request.
+
+        Args:
+            success (bool)
+                Whether the request succeeded or not.
+        """
+        with self._lock:
+            if success:
+                self.fail_count = 0
+                self.state = "closed"
+                return
+            self.fail_count += 1
+            if self.state == "half-open" or self.fail_count >= self.threshold:
+                if self.state != "open":
+                    log.warning("Too many consecutive request failures, opening the circuit.")
+                self.state = "open"
+                self.opened_at = time.monotonic()
 
 
 class PartnerPortalSession:
@@ -60,23 +210,83 @@ class PartnerPortalSession:
                 The API prefix URL.
             mandatory_params (dict, optional)
                 Mandatory parameters to pass for each API request, if any.
+            total_retries (int, optional)
+                The maximum number of retries for each request. Defaults to ``5``.
+            backoff_factor (float, optional)
+                The backoff factor between retries. Defaults to ``1``.
+            backoff_jitter (float, optional)
+                The maximum amount of random seconds to add to each backoff.
+                Defaults to ``1.0``.
+            status_forcelist (tuple, optional)
+                The HTTP status codes to retry. Defaults to ``408``, ``429`` and ``500``
+                to ``511``. POST requests are only retried on ``429``.
+            pool_connections (int, optional)
+                The number of connection pools to cache. Defaults to ``20``.
+            pool_maxsize (int, optional)
+                The maximum number of connections to keep in each pool. Defaults to ``50``.
+            default_timeout (float, optional)
+                The timeout in seconds for the requests without one. Defaults to ``30``.
+            breaker_threshold (int, optional)
+                The number of consecutive failed requests to refuse the next ones with
+                :class:`~cloudpub.error.CircuitOpenError`. Defaults to ``5``.
+            breaker_reset_seconds (float, optional)
+                The seconds to wait before allowing new requests. Defaults to ``30``.
         """
         self.auth_keys = self._validate_auth_keys(auth_keys)
         self._prefix_url = prefix_url
+        self._formatted_prefix_url = prefix_url.format(**self.auth_keys)
         self.resource = base_url(prefix_url)
+        self._login_url = self.LOGIN_URL_TMPL.format(**self.auth_keys)
+        self._login_data = {
+            "resource": self.resource,
+            "client_id": self.auth_keys["AZURE_CLIENT_ID"],
+            "client_secret": self.auth_keys["AZURE_API_SECRET"],
+            "grant_type": "client_credentials",
+        }
         self._mandatory_params = mandatory_params
         self._token: Optional[AccessToken] = None
+        self._token_lock = threading.Lock()
+        self._bearer_header = ""
         self._additional_args = kwargs
         self.session = requests.Session()
+        self.session.headers.update({"Accept": "application/json"})
         total_retries = kwargs.pop("total_retries", 5)
         backoff_factor = kwargs.pop("backoff_factor", 1)
-        status_forcelist = kwargs.pop("status_forcelist", tuple(range(500, 512)))
-        retries = Retry(
+        backoff_jitter = kwargs.pop("backoff_jitter", 1.0)
+        status_forcelist = kwargs.pop("status_forcelist", (408, 429) + tuple(range(500, 512)))
+        retries = JitterRetry(
             total=total_retries,
             backoff_factor=backoff_factor,
+            jitter=backoff_jitter,
             status_forcelist=status_forcelist,
+            # POST isn't idempotent (e.g. "configure"), so only retry it when throttled
+            throttled_methods={"POST"},
+            respect_retry_after_header=True,
+        )
+        pool_connections = kwargs.pop("pool_connections", 20)
+        pool_maxsize = kwargs.pop("pool_maxsize", 50)
+        default_timeout = kwargs.pop("default_timeout", 30)
+        adapter = TimeoutAdapter(
+            timeout=default_timeout,
+            max_retries=retries,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=False,
+        )
+        self.session.mount('https://', adapter)
+        # Use a dedicated connection pool for login so it can't be starved by the API requests
+        login_adapter = TimeoutAdapter(
+            timeout=default_timeout,
+            max_retries=retries,
+            pool_connections=2,
+            pool_maxsize=2,
+            pool_block=False,
+        )
+        self.session.mount(base_url(self.LOGIN_URL_TMPL), login_adapter)
+        self._breaker = CircuitBreaker(
+            threshold=kwargs.pop("breaker_threshold", 5),
+            reset_seconds=kwargs.pop("breaker_reset_seconds", 30),
         )
-        self.session.mount('https://', HTTPAdapter(max_retries=retries))
 
     @classmethod
     def make_graph_api_session(
@@ -107,59 +317,66 @@ class PartnerPortalSession:
             "AZURE_TENANT_ID",
             "AZURE_API_SECRET",
         ]
-        for key in mandatory_keys:
-            log.debug(f"Validating mandatory key \"{key}\"")
-            if key not in auth_keys.keys() or not auth_keys.get(key):
-                err_msg = f'The key/value for "{key}" must be set.'
-                log.error(err_msg)
-                raise ValueError(err_msg)
+        log.debug("Validating the mandatory keys: %s", mandatory_keys)
+        missing = [key for key in mandatory_keys if not auth_keys.get(key)]
+        if missing:
+            missing_str = ", ".join(f'"{key}"' for key in missing)
+            err_msg = f'The key/value for {missing_str} must be set.'
+            log.error(err_msg)
+            raise ValueError(err_msg)
         return auth_keys
 
     def _login(self) -> AccessToken:
         """Retrieve the authentication token from Microsoft."""
         log.info("Retrieving the bearer token from Microsoft")
-        url = self.LOGIN_URL_TMPL.format(**self.auth_keys)
-
-        headers = {
-            "Accept": "application/json",
-        }
-
-        data = {
-            "resource": self.resource,
-            "client_id": self.auth_keys["AZURE_CLIENT_ID"],
-            "client_secret": self.auth_keys["AZURE_API_SECRET"],
-            "grant_type": "client_credentials",
-        }
-
-        resp = self.session.post(url, headers=headers, data=data, timeout=30)
+        resp = self.session.post(self._login_url, data=self._login_data, timeout=30)
         resp.raise_for_status()
         return AccessToken(resp.json())
 
     def _get_token(self) -> str:
         """Request a new bearer token from Microsoft."""
         if not self._token or self._token.is_expired():
-            self._token = self._login()
+            # Only one thread should login while the others wait for the new token
+            with self._token_lock:
+                if not self._token or self._token.is_expired():
+                    self._token = self._login()
+                    self._bearer_header = f"Bearer {self._token.access_token}"
         log.debug("Serving the bearer token")
         return self._token.access_token
 
+    def _get_bearer_header(self) -> str:
+        """Return the value for the ``Authorization`` header with a valid bearer token."""
+        self._get_token()
+        return self._bearer_header
+
     def _request(
         self, method: str, path: str, params: Optional[Dict[str, Any]] = None, **kwargs: Any
     ) -> requests.Response:
         """Execute a generic API request."""
-        headers = {
-            "Accept": "application/json",
-            "Authorization": f"Bearer {self._get_token()}",
-        }
-
         if self._mandatory_params:
             if not params:
                 params = {}
             params.update(self._mandatory_params)
 
-        log.info(f"Sending a {method} request to {path}")
-        formatted_url = self._prefix_url.format(**self.auth_keys)
-        url = join_url(formatted_url, path)
-        return self.session.request(method, url=url, params=params, headers=headers, **kwargs)
+        log.info("Sending a %s request to %s", method, path)
+        url = join_url(self._formatted_prefix_url, path)
+
+        # Check the circuit before the token as it may require a login request
+        if not self._breaker.allow():
+            err_msg = f"Refusing to send a {method} request to {path}: the circuit is open."
+            log.error(err_msg)
+            raise CircuitOpenError(err_msg)
+        # Login errors aren't recorded as they don't tell whether the API is failing
+        headers = {
+            "Authorization": self._get_bearer_header(),
+        }
+        try:
+            resp = self.session.request(method, url=url, params=params, headers=headers, **kwargs)
+        except requests.RequestException:
+            self._breaker.record(False)
+            raise
+        self._breaker.record(resp.status_code < 500)
+        return resp
 
     def get(self, path: str, **kwargs: Any) -> requests.Response:
         """Execute an API GET request."""
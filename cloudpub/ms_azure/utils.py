@@ -1,7 +1,8 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 import logging
-from operator import attrgetter
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
 from deepdiff import DeepDiff
 
@@ -18,6 +19,13 @@ from cloudpub.utils import get_url_params
 
 log = logging.getLogger(__name__)
 
+_ARCH_CONV = {
+    "x86_64": "x64",
+    "aarch64": "arm64",
+}
+
+_VALID_GENS = frozenset(("V1", "V2"))
+
 
 class AzurePublishingMetadata(PublishingMetadata):
     """A collection of metadata necessary for publishing a VHD Image into a product."""
@@ -80,22 +88,15 @@ class AzurePublishingMetadata(PublishingMetadata):
 
     @staticmethod
     def __convert_arch(arch: str) -> str:
-        converter = {
-            "x86_64": "x64",
-            "aarch64": "arm64",
-        }
-        return converter.get(arch, "") or arch
+        return _ARCH_CONV.get(arch, arch)
 
     def __validate(self):
-        mandatory = [
-            "disk_version",
-            "generation",
-        ]
-        for param in mandatory:
-            if not getattr(self, param, None):
-                raise ValueError(f"The parameter \"{param}\" must not be None.")
-
-        if self.generation != "V1" and self.generation != "V2":
+        if not self.disk_version:
+            raise ValueError("The parameter \"disk_version\" must not be None.")
+        if not self.generation:
+            raise ValueError("The parameter \"generation\" must not be None.")
+
+        if self.generation not in _VALID_GENS:
             raise ValueError(
                 f"Invalid generation \"{self.generation}\". Expected: \"V1\" or \"V2\"."
             )
@@ -103,14 +104,33 @@ class AzurePublishingMetadata(PublishingMetadata):
             raise ValueError(f"Invalid SAS URI \"{self.image_path}\". Expected: http/https URL.")
 
 
+@lru_cache(maxsize=None)
 def get_image_type_mapping(architecture: str, generation: str) -> str:
     """Return the image type required by VMImageDefinition."""
-    gen_map = {
-        "V2": f"{architecture}Gen2",
-    }
-    if architecture == "x64":
-        gen_map.update({"V1": f"{architecture}Gen1"})
-    return gen_map.get(generation, "")
+    if generation == "V2":
+        return f"{architecture}Gen2"
+    # Only x64 supports the legacy generation
+    if generation == "V1" and architecture == "x64":
+        return f"{architecture}Gen1"
+    return ""
+
+
+SAS_UNIQUE_KEYS = frozenset({'st', 'se', 'sv', 'sig'})
+
+
+def _sas_params(sas: str) -> FrozenSet[Tuple[str, str]]:
+    """Return the SAS URI parameters except the unique ones."""
+    return frozenset((k, v) for k, v in get_url_params(sas).items() if k not in SAS_UNIQUE_KEYS)
+
+
+def _is_sas_params_eq(
+    params_sas1: FrozenSet[Tuple[str, str]], params_sas2: FrozenSet[Tuple[str, str]]
+) -> bool:
+    """Return True when both SAS parameters returned by :func:`_sas_params` are the same."""
+    if params_sas1 != params_sas2:
+        log.debug("Got different SAS parameters: %s - Expected: %s", params_sas1, params_sas2)
+        return False
+    return True
 
 
 def is_sas_eq(sas1: str, sas2: str) -> bool:
@@ -135,34 +155,16 @@ def is_sas_eq(sas1: str, sas2: str) -> bool:
     Returns:
         True when both SAS URIs are equivalent, False otherwise.
     """
-    base_sas1 = sas1.split("?")[0]
-    base_sas2 = sas2.split("?")[0]
-    unique_keys = ['st', 'se', 'sv', 'sig']
-
-    params_sas1 = {k: v for k, v in get_url_params(sas1).items() if k not in unique_keys}
-    params_sas2 = {k: v for k, v in get_url_params(sas2).items() if k not in unique_keys}
+    base_sas1 = sas1.partition("?")[0]
+    base_sas2 = sas2.partition("?")[0]
 
     # Base URL differs
     if base_sas1 != base_sas2:
-        log.debug("Got different base SAS: %s - Expected: %s" % (base_sas1, base_sas2))
-        return False
-
-    # Parameters lengh differs
-    if len(params_sas1) != len(params_sas2):
-        log.debug(
-            "Got different lengh of SAS parameters: len(%s) - Expected len(%s)"
-            % (params_sas1, params_sas2)
-        )
+        log.debug("Got different base SAS: %s - Expected: %s", base_sas1, base_sas2)
         return False
 
-    # Parameters values differs
-    for k, v in params_sas1.items():
-        if v != params_sas2.get(k, None):
-            log.debug("The SAS parameter %s doesn't match %s." % (v, params_sas2.get(k, None)))
-            return False
-
-    # Equivalent SAS
-    return True
+    # Equivalent SAS when the parameters don't differ
+    return _is_sas_params_eq(_sas_params(sas1), _sas_params(sas2))
 
 
 def is_sas_present(tech_config: VMIPlanTechConfig, sas_uri: str) -> bool:
@@ -177,9 +179,15 @@ def is_sas_present(tech_config: VMIPlanTechConfig, sas_uri: str) -> bool:
     Returns:
         bool: True when the SAS is present in the plan, False otherwise.
     """
+    # Parse the incoming SAS once and only parse the images with the same base URI
+    target_base = sas_uri.partition("?")[0]
+    target_params = _sas_params(sas_uri)
     for disk_version in tech_config.disk_versions:
         for img in disk_version.vm_images:
-            if is_sas_eq(img.source.os_disk.uri, sas_uri):
+            uri = img.source.os_disk.uri
+            if uri.partition("?")[0] != target_base:
+                continue
+            if _is_sas_params_eq(_sas_params(uri), target_params):
                 return True
     return False
 
@@ -194,11 +202,10 @@ def is_azure_job_not_complete(job_details: ConfigureStatus) -> bool:
     Returns:
         bool: False if job completed, True otherwise
     """
-    log.debug(f"Checking if the job \"{job_details.job_id}\" is still running")
-    log.debug(f"job {job_details.job_id} is in {job_details.job_status} state")
-    if job_details.job_status != "completed":
-        return True
-    return False
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Checking if the job \"%s\" is still running", job_details.job_id)
+        log.debug("job %s is in %s state", job_details.job_id, job_details.job_status)
+    return job_details.job_status != "completed"
 
 
 def is_legacy_gen_supported(metadata: AzurePublishingMetadata) -> bool:
@@ -241,32 +248,23 @@ def prepare_vm_images(
         raise ValueError(msg)
 
     raw_source = source.to_json()
-    json_gen1 = {
-        "imageType": get_image_type_mapping(metadata.architecture, "V1"),
-        "source": raw_source,
-    }
-    json_gen2 = {
-        "imageType": get_image_type_mapping(metadata.architecture, "V2"),
-        "source": raw_source,
-    }
+    img_type_v1 = get_image_type_mapping(metadata.architecture, "V1")
 
     if metadata.generation == "V2":
         # In this case we need to set a V2 SAS URI
-        gen2_new = VMImageDefinition.from_json(json_gen2)
+        img_type_v2 = get_image_type_mapping(metadata.architecture, "V2")
+        gen2_new = VMImageDefinition.from_json({"imageType": img_type_v2, "source": raw_source})
         if is_legacy_gen_supported(metadata):  # and in this case a V1 as well
-            gen1_new = VMImageDefinition.from_json(json_gen1)
+            gen1_new = VMImageDefinition.from_json({"imageType": img_type_v1, "source": raw_source})
             return [gen2_new, gen1_new]
         return [gen2_new]
     else:
         # It's expected to be a Gen1 only, let's get rid of Gen2
-        return [VMImageDefinition.from_json(json_gen1)]
+        return [VMImageDefinition.from_json({"imageType": img_type_v1, "source": raw_source})]
 
 
 def _len_vm_images(disk_versions: List[DiskVersion]) -> int:
-    count = 0
-    for disk_version in disk_versions:
-        count = count + len(disk_version.vm_images)
-    return count
+    return sum(len(disk_version.vm_images) for disk_version in disk_versions)
 
 
 def _build_skus(
@@ -276,11 +274,6 @@ def _build_skus(
     plan_name: str,
     security_type: Optional[List[str]] = None,
 ) -> List[VMISku]:
-    def get_skuid(arch):
-        if arch == "x64":
-            return plan_name
-        return f"{plan_name}-{arch.lower()}"
-
     sku_mapping: Dict[str, str] = {}
     # Update the SKUs for each image in DiskVersions if needed
     for disk_version in disk_versions:
@@ -288,23 +281,22 @@ def _build_skus(
         for vmid in disk_version.vm_images:
             # We'll name the main generation SKU as "{plan_name}" and
             # the alternate generation SKU as "{plan-name}-genX"
-            arch = vmid.image_type.split("Gen")[0]
+            arch = vmid.image_type.partition("Gen")[0]
             new_img_type = get_image_type_mapping(arch, default_gen)
             new_img_alt_type = get_image_type_mapping(arch, alt_gen)
 
             # we just want to add SKU whenever it's not set
-            skuid = get_skuid(arch)
+            skuid = plan_name if arch == "x64" else f"{plan_name}-{arch.lower()}"
             if vmid.image_type == new_img_type:
                 sku_mapping.setdefault(new_img_type, skuid)
             elif vmid.image_type == new_img_alt_type:
                 sku_mapping.setdefault(new_img_alt_type, f"{skuid}-gen{alt_gen[1:]}")
 
-    # Return the expected SKUs list
-    res = [
+    # Return the expected SKUs list sorted by their IDs
+    return [
         VMISku.from_json({"image_type": k, "id": v, "security_type": security_type})
-        for k, v in sku_mapping.items()
+        for k, v in sorted(sku_mapping.items(), key=itemgetter(1))
     ]
-    return sorted(res, key=attrgetter("id"))
 
 
 def _get_security_type(old_skus: List[VMISku]) -> Optional[List[str]]:
@@ -394,17 +386,18 @@ def create_disk_version_from_scratch(
         source (VMImageSource):
             The VMImageSource with the updated SAS URI.
     """
+    raw_source = source.to_json()
     vm_images = [
         {
             "imageType": get_image_type_mapping(metadata.architecture, metadata.generation),
-            "source": source.to_json(),
+            "source": raw_source,
         }
     ]
     if is_legacy_gen_supported(metadata):
         vm_images.append(
             {
                 "imageType": get_image_type_mapping(metadata.architecture, "V1"),
-                "source": source.to_json(),
+                "source": raw_source,
             }
         )
     json = {
@@ -436,13 +429,17 @@ def seek_disk_version(
         tech_config.plan_id,
     )
 
-    for dv in tech_config.disk_versions:
-        if version_number and dv.version_number == version_number:  # Metadata set
-            log.debug("Found the DiskVersion \"%s\" for plan \"%s\"", dv, tech_config.plan_id)
-            return dv
+    # There's nothing to seek when the metadata doesn't set the version number
+    if not version_number:
+        log.debug("Disk Version %s was not found.", version_number)
+        return None
 
-    log.debug("Disk Version %s was not found.", version_number)
-    return None
+    dv = next((dv for dv in tech_config.disk_versions if dv.version_number == version_number), None)
+    if dv:
+        log.debug("Found the DiskVersion \"%s\" for plan \"%s\"", dv, tech_config.plan_id)
+    else:
+        log.debug("Disk Version %s was not found.", version_number)
+    return dv
 
 
 def vm_images_by_generation(
@@ -452,6 +449,7 @@ def vm_images_by_generation(
     Return a tuple containing the Gen1 and Gen2 VHD images in this order.
 
     If one of the images doesn't exist it will return None in the expected tuple position.
+    The given ``disk_version`` is not modified.
 
     Args:
         disk_version
@@ -466,21 +464,14 @@ def vm_images_by_generation(
     # 1. vm_images => "Gen1" only
     # 2. vm_images => "Gen2" only
     # 3. vm_images => "Gen1" and "Gen2"
-
-    # So let's get the first image whatever it is
-    img = disk_version.vm_images.pop(0)
-
-    # If first `img` is Gen2 we set the other one as `img_legacy`
-    if img.image_type == get_image_type_mapping(architecture, "V2"):
-        img_legacy = disk_version.vm_images.pop(0) if len(disk_version.vm_images) > 0 else None
-
-    else:  # Otherwise we set it as `img_legacy` and get the gen2
-        img_legacy = img
-        img = (
-            disk_version.vm_images.pop(0)  # type: ignore
-            if len(disk_version.vm_images) > 0
-            else None
-        )
+    gen2_type = get_image_type_mapping(architecture, "V2")
+    img = img_legacy = None
+    # The Gen2 image is the current one while any other is the `img_legacy`
+    for vmid in disk_version.vm_images:
+        if vmid.image_type == gen2_type:
+            img = vmid
+        else:
+            img_legacy = vmid
     log.debug("Image for current generation: %s", img)
     log.debug("Image for legacy generation: %s", img_legacy)
     return img, img_legacy
@@ -501,21 +492,18 @@ def create_vm_image_definitions(
         A list with the new VMImageDefinitions.
     """
     log.debug("Creating VMImageDefinitions for \"%s\"", metadata.destination)
-    vm_images = []
+    generations = [metadata.generation]
+    if is_legacy_gen_supported(metadata):
+        generations.append("V1")
 
-    vm_images.append(
+    raw_source = source.to_json()
+    vm_images = [
         VMImageDefinition(
-            image_type=get_image_type_mapping(metadata.architecture, metadata.generation),
-            source=source.to_json(),
-        )
-    )
-    if is_legacy_gen_supported(metadata):
-        vm_images.append(
-            VMImageDefinition(
-                image_type=get_image_type_mapping(metadata.architecture, "V1"),
-                source=source.to_json(),
-            )
+            image_type=get_image_type_mapping(metadata.architecture, gen),
+            source=raw_source,
         )
+        for gen in generations
+    ]
     log.debug("VMImageDefinitions created for \"%s\": %s", metadata.destination, vm_images)
     return vm_images
 
@@ -538,14 +526,15 @@ def set_new_sas_disk_version(
     """
     # If we already have a VMImageDefinition let's use it
     if disk_version.vm_images:
-        log.debug("The DiskVersion \"%s\" contains inner images." % disk_version.version_number)
+        log.debug("The DiskVersion \"%s\" contains inner images.", disk_version.version_number)
         img, img_legacy = vm_images_by_generation(disk_version, metadata.architecture)
 
         # Now we replace the SAS URI for the vm_images
         log.debug(
             "Adjusting the VMImages from existing DiskVersion \"%s\""
-            "to fit the new image with SAS \"%s\"."
-            % (disk_version.version_number, metadata.image_path)
+            "to fit the new image with SAS \"%s\".",
+            disk_version.version_number,
+            metadata.image_path,
         )
         disk_version.vm_images = prepare_vm_images(
             metadata=metadata,
@@ -557,11 +546,12 @@ def set_new_sas_disk_version(
     # If no VMImages, we need to create them from scratch
     else:
         log.debug(
-            "The DiskVersion \"%s\" does not contain inner images." % disk_version.version_number
+            "The DiskVersion \"%s\" does not contain inner images.", disk_version.version_number
         )
         log.debug(
-            "Setting the new image \"%s\" on DiskVersion \"%s\"."
-            % (metadata.image_path, disk_version.version_number)
+            "Setting the new image \"%s\" on DiskVersion \"%s\".",
+            metadata.image_path,
+            disk_version.version_number,
         )
         disk_version.vm_images = create_vm_image_definitions(metadata, source)
 
@@ -570,5 +560,5 @@ def set_new_sas_disk_version(
 
 def logdiff(diff: DeepDiff) -> None:
     """Log the offer diff if it exists."""
-    if diff:
-        log.warning(f"Found the following offer diff before publishing:\n{diff.pretty()}")
+    if diff and log.isEnabledFor(logging.WARNING):
+        log.warning("Found the following offer diff before publishing:\n%s", diff.pretty())
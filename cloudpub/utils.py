@@ -1,8 +1,6 @@
-import logging
-import urllib.parse as urlparse
+from functools import lru_cache
 from typing import Dict
-
-log = logging.getLogger(__name__)
+from urllib.parse import urlsplit
 
 
 def get_url_params(url: str) -> Dict[str, str]:
@@ -20,21 +18,22 @@ def get_url_params(url: str) -> Dict[str, str]:
     Returns:
         dict: The parsed parameters
     """
-    parser = urlparse.urlparse(url)
-    params = parser.query
+    # The query string is everything after the first '?' until the fragment, if any.
+    params = url.partition("?")[2].partition("#")[0]
     # Check if URL has params
     if not params:
         return {}
     # The URL parameters separator is '&' while '=' is the key/value assignment for each param.
-    return {k: v for k, v in (x.split("=") for x in params.split("&") if x)}
+    return {k: v for k, _, v in (x.partition("=") for x in params.split("&") if x)}
 
 
 def join_url(*args: str) -> str:
     """Concatenate multiple URLs."""
-    return "/".join(arg.strip("/") for arg in args)
+    return "/".join([arg.strip("/") for arg in args])
 
 
+@lru_cache(maxsize=256)
 def base_url(url: str) -> str:
     """Return the base URL."""
-    parsed_url = urlparse.urlparse(url)
+    parsed_url = urlsplit(url)
     return f"{parsed_url.scheme}://{parsed_url.netloc}"
@@ -17,23 +17,27 @@
 # of attributes and also to improve visibility of inherited attributes on
 # subclasses (without duplicating their entire doc strings).
 #
-from typing import Any, List, Optional, Type
+from __future__ import annotations
+
+from operator import attrgetter
+from typing import Any, Dict, List, Type
 
 from sphinx.application import Sphinx
 
 
-def find_owning_class(klass: Type[object], attr_name: str) -> Optional[Type[object]]:
-    # Given an attribute name and a class on which it was found, return
-    # the class which owns that attribute (as opposed to inheriting it)
+def find_owning_classes(klass: Type[object]) -> Dict[str, Type[object]]:
+    # Given a class, return a mapping of each of its attribute names to the
+    # class which owns that attribute (as opposed to inheriting it)
+    owners: Dict[str, Type[object]] = {}
     for candidate in klass.__mro__:
         if not hasattr(candidate, "__attrs_attrs__"):
             continue
 
-        attr = getattr(candidate.__attrs_attrs__, attr_name)
-        if not attr.inherited:
-            # It belongs here
-            return candidate
-    return None
+        for attr in candidate.__attrs_attrs__:
+            if not attr.inherited:
+                # The closest class in the MRO owns it
+                owners.setdefault(attr.name, candidate)
+    return owners
 
 
 def add_attr_index(
@@ -42,17 +46,22 @@ def add_attr_index(
     if not hasattr(obj, "__attrs_attrs__"):
         return
 
-    attrs = sorted(obj.__attrs_attrs__, key=lambda attr: (not attr.inherited, attr.name))
+    # List the inherited attributes first, each group sorted by name
+    by_name = attrgetter("name")
+    inherited = sorted((a for a in obj.__attrs_attrs__ if a.inherited), key=by_name)
+    own = sorted((a for a in obj.__attrs_attrs__ if not a.inherited), key=by_name)
+    attrs = inherited + own
     if not attrs:
         return
 
     # We've got some attributes. Let's produce an index of them, linking to both
     # the inherited and local attributes.
 
+    owners = find_owning_classes(obj)
     lines.extend(["", "**Attributes:**", ""])
     for attr in attrs:
         if attr.inherited:
-            klass = find_owning_class(obj, attr.name)
+            klass = owners.get(attr.name)
             if klass:
                 line = f"* :meth:`~cloudpub.{klass.__name__}.{attr.name}` *[inherited]*"
         else:
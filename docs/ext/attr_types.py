@@ -1,11 +1,22 @@
 # This extension was based on pushsource's external sphinx extension:
 # https://github.com/release-engineering/pushsource/blob/master/docs/ext/attr_types.py
-import sys
-from typing import Any, List, Optional, Type
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Type
 
 import attr
 from sphinx.application import Sphinx
 
+import cloudpub
+
+
+@lru_cache(maxsize=None)
+def fields_dict(klass: Any) -> Dict[str, Any]:
+    # Sphinx processes each attribute of a class separately, so keep the
+    # fields of each class instead of rebuilding them for every attribute
+    return attr.fields_dict(klass)
+
 
 def add_attr_types(
     app: Sphinx, what: str, name: str, obj: Type[object], options: Any, lines: List[str]
@@ -18,7 +29,7 @@ def add_attr_types(
         # not an attribute => nothing to do
         return
 
-    if ":type:" in "".join(lines):
+    if any(":type:" in line for line in lines):
         # type has already been documented explicitly, don't
         # try to override it
         return
@@ -31,13 +42,13 @@ def add_attr_types(
         return
 
     (klass_name, field_name) = components[1:]
-    klass = getattr(sys.modules["cloudpub"], klass_name)
+    klass = getattr(cloudpub, klass_name)
 
     if not attr.has(klass):
         # not an attrs-using class, nothing to do
         return
 
-    field = attr.fields_dict(klass).get(field_name)
+    field = fields_dict(klass).get(field_name)
     if not field:
         # not a field
         return
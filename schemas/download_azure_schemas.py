@@ -8,9 +8,11 @@ Usage:
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict
 
 import requests
+from requests.adapters import HTTPAdapter
 
 # This script is used to download all schemas from Product Ingestion API
 # for the pinned version defined in `SCHEMAS_VERSION`
@@ -21,6 +23,9 @@ SCHEMAS_VERSION = "2022-03-01-preview2"
 SCHEMAS_URL = "https://product-ingestion.azureedge.net/schema/{RESOURCE}/{SCHEMAS_VERSION}"
 """The base URL to download the schemas."""
 
+_SCHEMAS_URL_TMPL = SCHEMAS_URL.replace("{SCHEMAS_VERSION}", SCHEMAS_VERSION)
+"""The base URL with the pinned version already set."""
+
 SCHEMAS_RESOURCES = [
     "product",
     "customer-leads",
@@ -40,6 +45,13 @@ SCHEMAS_RESOURCES = [
 ]
 """The list of schemas to download."""
 
+MAX_WORKERS = 8
+"""The maximum number of schemas to download at the same time."""
+
+SESSION = requests.Session()
+"""The HTTP session shared by all downloads to reuse the connections to the schemas host."""
+SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS))
+
 
 def get_schema_json(resource: str) -> Dict[str, Any]:
     """
@@ -52,8 +64,8 @@ def get_schema_json(resource: str) -> Dict[str, Any]:
         The parsed JSON from Microsoft.
     """
     print(f"Requesting the schema \"{resource}\" on version \"{SCHEMAS_VERSION}\"")
-    url = SCHEMAS_URL.format(RESOURCE=resource, SCHEMAS_VERSION=SCHEMAS_VERSION)
-    res = requests.get(url)
+    url = _SCHEMAS_URL_TMPL.replace("{RESOURCE}", resource)
+    res = SESSION.get(url, timeout=30)
     res.raise_for_status()
     return res.json()
 
@@ -85,10 +97,14 @@ def download_and_store(store_dir: str = "azure") -> None:
         print(f"Creating the storage directory \"{store_dir}\"")
         os.makedirs(store_dir)
 
-    for resource in SCHEMAS_RESOURCES:
-        out_file = os.path.join(store_dir, f"{resource}-{SCHEMAS_VERSION}.json")
-        data = get_schema_json(resource)
-        store_schema(out_file, data)
+    # The downloads don't depend on each other so they can run concurrently.
+    # Note: the printed messages may interleave.
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for resource, data in zip(
+            SCHEMAS_RESOURCES, executor.map(get_schema_json, SCHEMAS_RESOURCES)
+        ):
+            out_file = os.path.join(store_dir, f"{resource}-{SCHEMAS_VERSION}.json")
+            store_schema(out_file, data)
 
 
 if __name__ == "__main__":
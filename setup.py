@@ -9,8 +9,9 @@ setup(
     author_email='jgangi@redhat.com',
     url='https://github.com/release-engineering/cloudpub',
     license='GPLv3+',
-    packages=find_packages(exclude=['tests', 'tests.*']),
+    packages=find_packages(include=['cloudpub', 'cloudpub.*']),
     include_package_data=True,
+    python_requires='>=3.9',
     classifiers=[
         'License :: OSI Approved :: GNU General Public License v3 or later (GPLv3+)',
         'Programming Language :: Python :: 3.9',
@@ -1,4 +1,4 @@
-from typing import Any, Dict
+from typing import Any, Dict, Generator
 from unittest import mock
 
 import pytest
@@ -358,36 +358,53 @@ def version_metadata_obj(version_mapping: Dict[str, Any]) -> AWSVersionMetadata:
     return aws_version_metadata
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def aws_service() -> AWSProductService:
+    # Shared by all tests as creating the boto3 client is slow: patch instead of setting attributes
     return AWSProductService("fake-id", "fake-secret", "fake-region", 1, 0)
 
 
 @pytest.fixture
-def mock_describe_entity(aws_service: AWSProductService) -> mock.MagicMock:
-    return mock.patch.object(aws_service.marketplace, "describe_entity").start()
+def mock_describe_entity(aws_service: AWSProductService) -> Generator[mock.Mock, None, None]:
+    with mock.patch.object(aws_service.marketplace, "describe_entity", new_callable=mock.Mock) as m:
+        yield m
 
 
 @pytest.fixture
-def mock_list_entities(aws_service: AWSProductService) -> mock.MagicMock:
-    return mock.patch.object(aws_service.marketplace, "list_entities").start()
+def mock_list_entities(aws_service: AWSProductService) -> Generator[mock.Mock, None, None]:
+    with mock.patch.object(aws_service.marketplace, "list_entities", new_callable=mock.Mock) as m:
+        yield m
 
 
 @pytest.fixture
-def mock_start_change_set(aws_service: AWSProductService) -> mock.MagicMock:
-    return mock.patch.object(aws_service.marketplace, "start_change_set").start()
+def mock_start_change_set(aws_service: AWSProductService) -> Generator[mock.Mock, None, None]:
+    with mock.patch.object(
+        aws_service.marketplace, "start_change_set", new_callable=mock.Mock
+    ) as m:
+        yield m
 
 
 @pytest.fixture
-def mock_cancel_change_set(aws_service: AWSProductService) -> mock.MagicMock:
-    return mock.patch.object(aws_service.marketplace, "cancel_change_set").start()
+def mock_cancel_change_set(aws_service: AWSProductService) -> Generator[mock.Mock, None, None]:
+    with mock.patch.object(
+        aws_service.marketplace, "cancel_change_set", new_callable=mock.Mock
+    ) as m:
+        yield m
 
 
 @pytest.fixture
-def mock_describe_change_set(aws_service: AWSProductService) -> mock.MagicMock:
-    return mock.patch.object(aws_service.marketplace, "describe_change_set").start()
+def mock_describe_change_set(
+    aws_service: AWSProductService,
+) -> Generator[mock.Mock, None, None]:
+    with mock.patch.object(
+        aws_service.marketplace, "describe_change_set", new_callable=mock.Mock
+    ) as m:
+        yield m
 
 
 @pytest.fixture
-def mock_list_change_sets(aws_service: AWSProductService) -> mock.MagicMock:
-    return mock.patch.object(aws_service.marketplace, "list_change_sets").start()
+def mock_list_change_sets(aws_service: AWSProductService) -> Generator[mock.Mock, None, None]:
+    with mock.patch.object(
+        aws_service.marketplace, "list_change_sets", new_callable=mock.Mock
+    ) as m:
+        yield m
@@ -113,6 +113,37 @@ def test_convert_source(
     )
 
 
+def test_convert_source_attribute_names(
+    product_versions_cloud_formation_source: Dict[str, Any],
+    product_versions_virtualization_source: Dict[str, Any],
+) -> None:
+    for source in (product_versions_cloud_formation_source, product_versions_virtualization_source):
+        source["type"] = source.pop("Type")
+
+    assert isinstance(
+        convert_source(product_versions_cloud_formation_source), ProductVersionsCloudFormationSource
+    )
+    assert isinstance(
+        convert_source(product_versions_virtualization_source), ProductVersionsVirtualizationSource
+    )
+
+
+@pytest.mark.parametrize("source", [None, {}])
+def test_convert_source_empty(source: Any) -> None:
+    assert convert_source(source) is None
+
+
+@pytest.mark.parametrize("source_type", ["invalid", None])
+def test_convert_source_invalid_type(
+    source_type: Any, product_versions_virtualization_source: Dict[str, Any]
+) -> None:
+    err = "Invalid value for type. Expected: ['AmazonMachineImage', 'CloudFormationTemplate']"
+    product_versions_virtualization_source["Type"] = source_type
+
+    with pytest.raises(ValueError, match=re.escape(err)):
+        convert_source(product_versions_virtualization_source)
+
+
 def test_describe_entity_response_parsed_details(
     describe_entity_response_base: Dict[str, Any], details_entity_json: Dict[str, Any]
 ) -> None:
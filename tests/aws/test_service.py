@@ -1,7 +1,6 @@
 import json
 import logging
-from copy import deepcopy
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 from unittest import mock
 
 import pytest
@@ -17,6 +16,38 @@ from cloudpub.models.aws import (
     VersionMapping,
 )
 
+EMPTY_DETAILS_JSON = json.dumps({"Versions": []})
+
+RESTRICT_IDS = ["1234-1234-1234-1234"]
+EXPECTED_RESTRICT_CHANGE_SET = {
+    "Catalog": "AWSMarketplace",
+    "ChangeSet": [
+        {
+            "ChangeType": "RestrictDeliveryOptions",
+            "Entity": {
+                "Type": "fake-product-type@1.0",
+                "Identifier": "fake-entity-id",
+            },
+            "Details": json.dumps({"DeliveryOptionIds": RESTRICT_IDS}),
+        }
+    ],
+}
+
+
+class DeliveryOptionsDocument:
+    """Match any DetailsDocument holding a non-empty list of delivery option dicts."""
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, dict):
+            return False
+        delivery_options = other.get("DeliveryOptions")
+        if not isinstance(delivery_options, list) or not delivery_options:
+            return False
+        return isinstance(delivery_options[0], dict)
+
+    def __repr__(self) -> str:
+        return "<DetailsDocument with DeliveryOptions>"
+
 
 @pytest.fixture
 def fake_entity_summary() -> Dict[str, Any]:
@@ -30,6 +61,117 @@ def fake_entity_summary() -> Dict[str, Any]:
     }
 
 
+@pytest.fixture
+def restrict_minor_version_ids() -> Dict[str, Any]:
+    return {
+        '6.9 20220513-0': {
+            "delivery_options": [
+                DeliveryOption.from_json({"id": 'fake-6.9 ', "visibility": "Public"})
+            ],
+            "created_date": "2022-01-24T12:41:25.503Z",
+            "ami_ids": ["ami-fake-id-6-9"],
+        },
+        '7.9 20220513-0': {
+            "delivery_options": [
+                DeliveryOption.from_json({"id": 'fake-7.9 ', "visibility": "Public"})
+            ],
+            "created_date": "2022-01-24T12:41:25.503Z",
+            "ami_ids": ["ami-fake-id-newest-7"],
+        },
+        '7.8 20220513-0': {
+            "delivery_options": [
+                DeliveryOption.from_json({"id": 'fake-7.8', "visibility": "Public"})
+            ],
+            "created_date": "2022-01-24T12:41:25.503Z",
+            "ami_ids": ["ami-fake-id-2"],
+        },
+        '8.9 20220513-0': {
+            "delivery_options": [
+                DeliveryOption.from_json({"id": 'fake-8.9', "visibility": "Public"})
+            ],
+            "created_date": "2022-01-24T12:41:25.503Z",
+            "ami_ids": ["ami-fake-id-3"],
+        },
+        '8.8 20220513-0': {
+            "delivery_options": [
+                DeliveryOption.from_json({"id": 'fake-8.8', "visibility": "Public"})
+            ],
+            "created_date": "2022-01-24T12:41:25.503Z",
+            "ami_ids": ["ami-fake-id-4"],
+        },
+        '8.10 20220513-0': {
+            "delivery_options": [
+                DeliveryOption.from_json({"id": 'fake-8.10', "visibility": "Public"})
+            ],
+            "created_date": "2022-01-24T12:41:25.503Z",
+            "ami_ids": ["ami-fake-id-newest-8"],
+        },
+        '9.0 20220513-0': {
+            "delivery_options": [
+                DeliveryOption.from_json({"id": 'fake-9.0.0', "visibility": "Public"})
+            ],
+            "created_date": "2024-01-24T12:41:25.503Z",
+            "ami_ids": ["ami-fake-id-5"],
+        },
+        '9.0 20220613': {
+            "delivery_options": [
+                DeliveryOption.from_json({"id": 'fake-9.0.1', "visibility": "Public"})
+            ],
+            "created_date": "2023-02-24T12:41:25.503Z",
+            "ami_ids": ["ami-fake-id-6"],
+        },
+        '9.0 20220713': {
+            "delivery_options": [
+                DeliveryOption.from_json({"id": 'fake-9.0.2', "visibility": "Public"})
+            ],
+            "created_date": "2022-03-24T12:41:25.503Z",
+            "ami_ids": ["ami-fake-id-7"],
+        },
+        '9.0 20220813': {
+            "delivery_options": [
+                DeliveryOption.from_json({"id": 'fake-9.0.3', "visibility": "Public"})
+            ],
+            "created_date": "2021-04-24T12:41:25.503Z",
+            "ami_ids": ["ami-fake-id-8"],
+        },
+        '9.0 20220916': {
+            "delivery_options": [
+                DeliveryOption.from_json({"id": 'fake-9.0.4', "visibility": "Public"})
+            ],
+            "created_date": "2020-05-24T12:41:25.503Z",
+            "ami_ids": ["ami-fake-id-9"],
+        },
+        '9.1 20220915': {
+            "delivery_options": [
+                DeliveryOption.from_json({"id": 'fake-9.1.3', "visibility": "Restricted"})
+            ],
+            "created_date": "2025-03-24T12:41:25.503Z",
+            "ami_ids": ["ami-fake-id-10"],
+        },
+        '9.1 20220913': {
+            "delivery_options": [
+                DeliveryOption.from_json({"id": 'fake-9.1.1', "visibility": "Public"})
+            ],
+            "created_date": "2024-03-24T12:41:25.503Z",
+            "ami_ids": ["ami-fake-id-newest-9"],
+        },
+        '9.1 20220513': {
+            "delivery_options": [
+                DeliveryOption.from_json({"id": 'fake-9.1.2', "visibility": "Public"})
+            ],
+            "created_date": "2023-03-24T12:41:25.503Z",
+            "ami_ids": ["ami-fake-id-11"],
+        },
+        'BadVersion': {
+            "delivery_options": [
+                DeliveryOption.from_json({"id": 'fake-id1-6', "visibility": "Public"})
+            ],
+            "created_date": "2022-01-24T12:41:25.503Z",
+            "ami_ids": ["ami-fake-id-12"],
+        },
+    }
+
+
 class TestAWSVersionMetadata:
     def test_load_data(self, version_mapping_obj: VersionMapping):
         aws_version_metadata = AWSVersionMetadata(
@@ -50,7 +192,7 @@ class TestAWSVersionMetadata:
 class TestAWSProductService:
     def test_get_product_by_id(
         self,
-        mock_describe_entity: mock.MagicMock,
+        mock_describe_entity: mock.Mock,
         aws_service: AWSProductService,
         describe_entity_response: Dict[str, Any],
     ) -> None:
@@ -66,7 +208,7 @@ class TestAWSProductService:
 
     def test_get_product_by_id_missing_details(
         self,
-        mock_describe_entity: mock.MagicMock,
+        mock_describe_entity: mock.Mock,
         aws_service: AWSProductService,
         describe_entity_response: Dict[str, Any],
     ) -> None:
@@ -78,8 +220,8 @@ class TestAWSProductService:
 
     def test_get_product_by_product_name(
         self,
-        mock_list_entities: mock.MagicMock,
-        mock_describe_entity: mock.MagicMock,
+        mock_list_entities: mock.Mock,
+        mock_describe_entity: mock.Mock,
         aws_service: AWSProductService,
         describe_entity_response: Dict[str, Any],
         fake_entity_summary: Dict[str, Any],
@@ -103,42 +245,37 @@ class TestAWSProductService:
 
     def test_get_product_by_product_name_no_product(
         self,
-        mock_list_entities: mock.MagicMock,
-        mock_describe_entity: mock.MagicMock,
+        mock_list_entities: mock.Mock,
+        mock_describe_entity: mock.Mock,
         aws_service: AWSProductService,
     ) -> None:
         mock_list_entities.return_value = {"EntitySummaryList": []}
-        details_json = json.dumps({"Versions": []})
-        mock_describe_entity.return_value = {"Details": details_json}
+        mock_describe_entity.return_value = {"Details": EMPTY_DETAILS_JSON}
         with pytest.raises(NotFoundError, match="No such product with name \"fake-product\""):
             _ = aws_service.get_product_by_name("fake-product-type", "fake-product")
 
     def test_get_product_by_product_name_no_match(
         self,
-        mock_list_entities: mock.MagicMock,
-        mock_describe_entity: mock.MagicMock,
+        mock_list_entities: mock.Mock,
+        mock_describe_entity: mock.Mock,
         aws_service: AWSProductService,
     ) -> None:
         mock_list_entities.return_value = {"EntitySummaryList": [{}]}
-        details_json = json.dumps({"Versions": []})
-        mock_describe_entity.return_value = {"Details": details_json}
+        mock_describe_entity.return_value = {"Details": EMPTY_DETAILS_JSON}
         with pytest.raises(NotFoundError, match="No such product with name \"fake-product\""):
             _ = aws_service.get_product_by_name("fake-product-type", "fake-product")
 
     def test_get_product_by_product_name_multiple_match(
         self,
-        mock_list_entities: mock.MagicMock,
-        mock_describe_entity: mock.MagicMock,
+        mock_list_entities: mock.Mock,
+        mock_describe_entity: mock.Mock,
         aws_service: AWSProductService,
         fake_entity_summary: Dict[str, Any],
     ) -> None:
-        entity1 = fake_entity_summary
-        entity2 = deepcopy(fake_entity_summary)
-        entity1["EntityId"] = "35235325234234"
-        entity2["EntityId"] = "1234213412341234"
+        entity1 = {**fake_entity_summary, "EntityId": "35235325234234"}
+        entity2 = {**fake_entity_summary, "EntityId": "1234213412341234"}
         mock_list_entities.return_value = {"EntitySummaryList": [entity1, entity2]}
-        details_json = json.dumps({"Versions": []})
-        mock_describe_entity.return_value = {"Details": details_json}
+        mock_describe_entity.return_value = {"Details": EMPTY_DETAILS_JSON}
         with pytest.raises(
             InvalidStateError, match="Multiple responses found for \"fake-product\""
         ):
@@ -146,15 +283,13 @@ class TestAWSProductService:
 
     def test_get_product_version_details(
         self,
-        mock_describe_entity: mock.MagicMock,
+        mock_describe_entity: mock.Mock,
         aws_service: AWSProductService,
         fake_entity_summary: Dict[str, Any],
         delivery_option: Dict[str, str],
     ) -> None:
-        do1 = delivery_option
-        do2 = deepcopy(delivery_option)
-        do1["Id"] = "some-version-id"
-        do2["Id"] = "fake-id2"
+        do1 = {**delivery_option, "Id": "some-version-id"}
+        do2 = {**delivery_option, "Id": "fake-id2"}
         details_json: Dict[str, Any] = {
             "Versions": [
                 {
@@ -182,7 +317,7 @@ class TestAWSProductService:
 
     def test_get_product_version_details_no_match(
         self,
-        mock_describe_entity: mock.MagicMock,
+        mock_describe_entity: mock.Mock,
         aws_service: AWSProductService,
         fake_entity_summary: Dict[str, Any],
     ) -> None:
@@ -206,7 +341,7 @@ class TestAWSProductService:
 
     def test_get_product_versions(
         self,
-        mock_describe_entity: mock.MagicMock,
+        mock_describe_entity: mock.Mock,
         aws_service: AWSProductService,
         fake_entity_summary: Dict[str, Any],
     ) -> None:
@@ -304,21 +439,30 @@ class TestAWSProductService:
             v["delivery_options"][0].id = "fake-id2"
             assert v["ami_ids"] == ["ami-id-fake"]
 
-    def test_get_product_versions_no_version(
+    @pytest.mark.parametrize(
+        "method,args",
+        [
+            ("get_product_version_details", ("fake-entity-id", "some-version-id")),
+            ("get_product_versions", ("fake-entity-id",)),
+            ("get_product_version_by_name", ("fake-product-type", "Fake-Version")),
+        ],
+    )
+    def test_get_product_no_versions(
         self,
-        mock_describe_entity: mock.MagicMock,
+        mock_describe_entity: mock.Mock,
         aws_service: AWSProductService,
         fake_entity_summary: Dict[str, Any],
+        method: str,
+        args: Tuple[str, ...],
     ) -> None:
-        details_json: Dict[str, Any] = {"Versions": []}
-        fake_entity_summary["DetailsDocument"] = details_json
+        fake_entity_summary["DetailsDocument"] = {"Versions": []}
         mock_describe_entity.return_value = fake_entity_summary
         with pytest.raises(NotFoundError, match="This product has no versions"):
-            _ = aws_service.get_product_versions("fake-entity-id")
+            _ = getattr(aws_service, method)(*args)
 
     def test_get_product_version_by_name(
         self,
-        mock_describe_entity: mock.MagicMock,
+        mock_describe_entity: mock.Mock,
         aws_service: AWSProductService,
         fake_entity_summary: Dict[str, Any],
     ) -> None:
@@ -353,21 +497,9 @@ class TestAWSProductService:
         )
         assert version_details.id == "fake-id1"
 
-    def test_get_product_version_by_name_no_version(
-        self,
-        mock_describe_entity: mock.MagicMock,
-        aws_service: AWSProductService,
-        fake_entity_summary: Dict[str, Any],
-    ) -> None:
-        details_json: Dict[str, Any] = {"Versions": []}
-        fake_entity_summary["DetailsDocument"] = details_json
-        mock_describe_entity.return_value = fake_entity_summary
-        with pytest.raises(NotFoundError, match="This product has no versions"):
-            _ = aws_service.get_product_version_by_name("fake-product-type", "Fake-Version")
-
     def test_get_product_version_by_name_no_match(
         self,
-        mock_describe_entity: mock.MagicMock,
+        mock_describe_entity: mock.Mock,
         aws_service: AWSProductService,
         fake_entity_summary: Dict[str, Any],
     ) -> None:
@@ -399,31 +531,17 @@ class TestAWSProductService:
             _ = aws_service.get_product_version_by_name("fake-entity-id", "Fake-Version")
 
     def test_set_restrict_versions(
-        self, mock_start_change_set: mock.MagicMock, aws_service: AWSProductService
+        self, mock_start_change_set: mock.Mock, aws_service: AWSProductService
     ) -> None:
         ret = {"ChangeSetId": "Fake-Changeset"}
         mock_start_change_set.return_value = ret
-        restrict_ids = ["1234-1234-1234-1234"]
-        rep = aws_service.set_restrict_versions("fake-entity-id", "fake-product-type", restrict_ids)
+        rep = aws_service.set_restrict_versions("fake-entity-id", "fake-product-type", RESTRICT_IDS)
 
-        change_details = {"DeliveryOptionIds": restrict_ids}
-        mock_start_change_set.assert_called_once_with(
-            Catalog="AWSMarketplace",
-            ChangeSet=[
-                {
-                    "ChangeType": "RestrictDeliveryOptions",
-                    "Entity": {
-                        "Type": "fake-product-type@1.0",
-                        "Identifier": "fake-entity-id",
-                    },
-                    "Details": json.dumps(change_details),
-                }
-            ],
-        )
+        mock_start_change_set.assert_called_once_with(**EXPECTED_RESTRICT_CHANGE_SET)
         assert rep == "Fake-Changeset"
 
     def test_cancel_change_set(
-        self, mock_cancel_change_set: mock.MagicMock, aws_service: AWSProductService
+        self, mock_cancel_change_set: mock.Mock, aws_service: AWSProductService
     ) -> None:
         ret = {"ChangeSetId": "Fake-Changeset"}
         mock_cancel_change_set.return_value = ret
@@ -435,7 +553,7 @@ class TestAWSProductService:
         assert rep == "Fake-Changeset"
 
     def test_check_publish_status(
-        self, mock_describe_change_set: mock.MagicMock, aws_service: AWSProductService
+        self, mock_describe_change_set: mock.Mock, aws_service: AWSProductService
     ) -> None:
         ret = {
             "ChangeSetId": "fake-id",
@@ -450,7 +568,7 @@ class TestAWSProductService:
         assert status == "Succeeded"
 
     def test_check_publish_status_failed(
-        self, mock_describe_change_set: mock.MagicMock, aws_service: AWSProductService
+        self, mock_describe_change_set: mock.Mock, aws_service: AWSProductService
     ) -> None:
         failure_list = [
             {
@@ -479,7 +597,7 @@ class TestAWSProductService:
             _ = aws_service.check_publish_status("fake-change-set-id")
 
     def test_check_publish_status_failed_url(
-        self, mock_describe_change_set: mock.MagicMock, aws_service: AWSProductService
+        self, mock_describe_change_set: mock.Mock, aws_service: AWSProductService
     ) -> None:
         @urlmatch(netloc=r'(.*\.)?fake\.com$')
         def request_mock(url, request):
@@ -516,7 +634,7 @@ class TestAWSProductService:
             assert "EOL" in str(error)
 
     def test_wait_for_changeset(
-        self, mock_describe_change_set: mock.MagicMock, aws_service: AWSProductService
+        self, mock_describe_change_set: mock.Mock, aws_service: AWSProductService
     ) -> None:
         ret = {
             "ChangeSetId": "change",
@@ -531,7 +649,7 @@ class TestAWSProductService:
         aws_service.wait_for_changeset("fake-change-set-id")
 
     def test_wait_for_changeset_timeout(
-        self, mock_describe_change_set: mock.MagicMock, aws_service: AWSProductService
+        self, mock_describe_change_set: mock.Mock, aws_service: AWSProductService
     ) -> None:
         ret = {
             "ChangeSetId": "change",
@@ -546,14 +664,17 @@ class TestAWSProductService:
         with pytest.raises(Timeout, match="Timed out waiting for fake-change-set-id to finish"):
             aws_service.wait_for_changeset("fake-change-set-id")
 
-    @mock.patch("cloudpub.aws.AWSProductService.wait_for_changeset")
+    @pytest.mark.parametrize("keepdraft,intent", [(False, "APPLY"), (True, "VALIDATE")])
+    @mock.patch.object(AWSProductService, "wait_for_changeset")
     def test_publish(
         self,
         mock_wait_for_changeset: mock.MagicMock,
         aws_service: AWSProductService,
         version_metadata_obj: AWSVersionMetadata,
-        mock_start_change_set: mock.MagicMock,
+        mock_start_change_set: mock.Mock,
         caplog: LogCaptureFixture,
+        keepdraft: bool,
+        intent: str,
     ) -> None:
         mock_start_change_set.return_value = {
             "ResponseMetadata": {
@@ -603,6 +724,7 @@ class TestAWSProductService:
             ],
         }
 
+        version_metadata_obj.keepdraft = keepdraft
         with caplog.at_level(logging.DEBUG):
             aws_service.publish(version_metadata_obj)
         assert "UpdateDeliveryOptions" in caplog.text
@@ -617,28 +739,25 @@ class TestAWSProductService:
                         "Type": "fake-product-type@1.0",
                         "Identifier": "fake-entity-id",
                     },
-                    "DetailsDocument": mock.ANY,
+                    "DetailsDocument": DeliveryOptionsDocument(),
                 },
             ],
-            Intent="APPLY",
+            Intent=intent,
         )
         mock_wait_for_changeset.assert_called_once_with("fake-change-set-id")
 
         _, asserted_kwargs = mock_start_change_set.call_args
         details_json = asserted_kwargs["ChangeSet"][0]["DetailsDocument"]
-        assert isinstance(details_json, dict)
-        assert isinstance(details_json["DeliveryOptions"], list)
-        assert isinstance(details_json["DeliveryOptions"][0], dict)
         assert "Id" not in details_json["DeliveryOptions"][0]
 
-    @mock.patch("cloudpub.aws.AWSProductService.wait_for_changeset")
+    @mock.patch.object(AWSProductService, "wait_for_changeset")
     def test_publish_overwrite(
         self,
         mock_wait_for_changeset: mock.MagicMock,
-        mock_describe_entity: mock.MagicMock,
+        mock_describe_entity: mock.Mock,
         aws_service: AWSProductService,
         version_metadata_obj: AWSVersionMetadata,
-        mock_start_change_set: mock.MagicMock,
+        mock_start_change_set: mock.Mock,
         fake_entity_summary: Dict[str, Any],
     ) -> None:
         details_json = {
@@ -682,7 +801,7 @@ class TestAWSProductService:
                         "Type": "fake-product-type@1.0",
                         "Identifier": "fake-entity-id",
                     },
-                    "DetailsDocument": mock.ANY,
+                    "DetailsDocument": DeliveryOptionsDocument(),
                 },
             ],
             Intent="APPLY",
@@ -691,172 +810,26 @@ class TestAWSProductService:
 
         _, asserted_kwargs = mock_start_change_set.call_args
         details_json = asserted_kwargs["ChangeSet"][0]["DetailsDocument"]
-        assert isinstance(details_json, dict)
-        assert isinstance(details_json["DeliveryOptions"], list)
-        assert isinstance(details_json["DeliveryOptions"][0], dict)
         assert details_json["DeliveryOptions"][0]["Id"] == "fake-id1"
 
-    @mock.patch("cloudpub.aws.AWSProductService.wait_for_changeset")
-    def test_publish_keepdraft(
-        self,
-        mock_wait_for_changeset: mock.MagicMock,
-        aws_service: AWSProductService,
-        version_metadata_obj: AWSVersionMetadata,
-        mock_start_change_set: mock.MagicMock,
-    ) -> None:
-        mock_start_change_set.return_value = {"ChangeSetId": "fake-change-set-id"}
-
-        version_metadata_obj.keepdraft = True
-        aws_service.publish(version_metadata_obj)
-
-        mock_start_change_set.assert_called_once_with(
-            Catalog="AWSMarketplace",
-            ChangeSet=[
-                {
-                    "ChangeType": "AddDeliveryOptions",
-                    "Entity": {
-                        "Type": "fake-product-type@1.0",
-                        "Identifier": "fake-entity-id",
-                    },
-                    "DetailsDocument": mock.ANY,
-                },
-            ],
-            Intent="VALIDATE",
-        )
-        mock_wait_for_changeset.assert_called_once_with("fake-change-set-id")
-
-        _, asserted_kwargs = mock_start_change_set.call_args
-        details_json = asserted_kwargs["ChangeSet"][0]["DetailsDocument"]
-        assert isinstance(details_json, dict)
-        assert isinstance(details_json["DeliveryOptions"], list)
-        assert isinstance(details_json["DeliveryOptions"][0], dict)
-        assert "Id" not in details_json["DeliveryOptions"][0]
-
-    @mock.patch("cloudpub.aws.AWSProductService.get_product_versions")
-    @mock.patch("cloudpub.aws.AWSProductService.set_restrict_versions")
-    @mock.patch("cloudpub.aws.AWSProductService.wait_for_changeset")
+    @mock.patch.object(AWSProductService, "get_product_versions")
+    @mock.patch.object(AWSProductService, "set_restrict_versions")
+    @mock.patch.object(AWSProductService, "wait_for_changeset")
     def test_restrict_minor_versions(
         self,
         mock_wait_for_changeset: mock.MagicMock,
         mock_set_restrict_versions: mock.MagicMock,
         get_product_versions: mock.MagicMock,
         aws_service: AWSProductService,
+        restrict_minor_version_ids: Dict[str, Any],
     ) -> None:
-        mock_version_ids = {
-            '6.9 20220513-0': {
-                "delivery_options": [
-                    DeliveryOption.from_json({"id": 'fake-6.9 ', "visibility": "Public"})
-                ],
-                "created_date": "2022-01-24T12:41:25.503Z",
-                "ami_ids": ["ami-fake-id-6-9"],
-            },
-            '7.9 20220513-0': {
-                "delivery_options": [
-                    DeliveryOption.from_json({"id": 'fake-7.9 ', "visibility": "Public"})
-                ],
-                "created_date": "2022-01-24T12:41:25.503Z",
-                "ami_ids": ["ami-fake-id-newest-7"],
-            },
-            '7.8 20220513-0': {
-                "delivery_options": [
-                    DeliveryOption.from_json({"id": 'fake-7.8', "visibility": "Public"})
-                ],
-                "created_date": "2022-01-24T12:41:25.503Z",
-                "ami_ids": ["ami-fake-id-2"],
-            },
-            '8.9 20220513-0': {
-                "delivery_options": [
-                    DeliveryOption.from_json({"id": 'fake-8.9', "visibility": "Public"})
-                ],
-                "created_date": "2022-01-24T12:41:25.503Z",
-                "ami_ids": ["ami-fake-id-3"],
-            },
-            '8.8 20220513-0': {
-                "delivery_options": [
-                    DeliveryOption.from_json({"id": 'fake-8.8', "visibility": "Public"})
-                ],
-                "created_date": "2022-01-24T12:41:25.503Z",
-                "ami_ids": ["ami-fake-id-4"],
-            },
-            '8.10 20220513-0': {
-                "delivery_options": [
-                    DeliveryOption.from_json({"id": 'fake-8.10', "visibility": "Public"})
-                ],
-                "created_date": "2022-01-24T12:41:25.503Z",
-                "ami_ids": ["ami-fake-id-newest-8"],
-            },
-            '9.0 20220513-0': {
-                "delivery_options": [
-                    DeliveryOption.from_json({"id": 'fake-9.0.0', "visibility": "Public"})
-                ],
-                "created_date": "2024-01-24T12:41:25.503Z",
-                "ami_ids": ["ami-fake-id-5"],
-            },
-            '9.0 20220613': {
-                "delivery_options": [
-                    DeliveryOption.from_json({"id": 'fake-9.0.1', "visibility": "Public"})
-                ],
-                "created_date": "2023-02-24T12:41:25.503Z",
-                "ami_ids": ["ami-fake-id-6"],
-            },
-            '9.0 20220713': {
-                "delivery_options": [
-                    DeliveryOption.from_json({"id": 'fake-9.0.2', "visibility": "Public"})
-                ],
-                "created_date": "2022-03-24T12:41:25.503Z",
-                "ami_ids": ["ami-fake-id-7"],
-            },
-            '9.0 20220813': {
-                "delivery_options": [
-                    DeliveryOption.from_json({"id": 'fake-9.0.3', "visibility": "Public"})
-                ],
-                "created_date": "2021-04-24T12:41:25.503Z",
-                "ami_ids": ["ami-fake-id-8"],
-            },
-            '9.0 20220916': {
-                "delivery_options": [
-                    DeliveryOption.from_json({"id": 'fake-9.0.4', "visibility": "Public"})
-                ],
-                "created_date": "2020-05-24T12:41:25.503Z",
-                "ami_ids": ["ami-fake-id-9"],
-            },
-            '9.1 20220915': {
-                "delivery_options": [
-                    DeliveryOption.from_json({"id": 'fake-9.1.3', "visibility": "Restricted"})
-                ],
-                "created_date": "2025-03-24T12:41:25.503Z",
-                "ami_ids": ["ami-fake-id-10"],
-            },
-            '9.1 20220913': {
-                "delivery_options": [
-                    DeliveryOption.from_json({"id": 'fake-9.1.1', "visibility": "Public"})
-                ],
-                "created_date": "2024-03-24T12:41:25.503Z",
-                "ami_ids": ["ami-fake-id-newest-9"],
-            },
-            '9.1 20220513': {
-                "delivery_options": [
-                    DeliveryOption.from_json({"id": 'fake-9.1.2', "visibility": "Public"})
-                ],
-                "created_date": "2023-03-24T12:41:25.503Z",
-                "ami_ids": ["ami-fake-id-11"],
-            },
-            'BadVersion': {
-                "delivery_options": [
-                    DeliveryOption.from_json({"id": 'fake-id1-6', "visibility": "Public"})
-                ],
-                "created_date": "2022-01-24T12:41:25.503Z",
-                "ami_ids": ["ami-fake-id-12"],
-            },
-        }
-
         not_restricted_versions = [
             'ami-fake-id-newest-9',
             'ami-fake-id-newest-8',
             'ami-fake-id-newest-7',
         ]
 
-        get_product_versions.return_value = mock_version_ids
+        get_product_versions.return_value = restrict_minor_version_ids
         mock_set_restrict_versions.return_value = "fake-change-set-id1"
 
         restricted_vers = aws_service.restrict_versions("fake-entity", "fake-entity-type", 3, 1)
@@ -895,9 +868,9 @@ class TestAWSProductService:
 
         assert not_restricted_versions not in restricted_vers
 
-    @mock.patch("cloudpub.aws.AWSProductService.get_product_versions")
-    @mock.patch("cloudpub.aws.AWSProductService.set_restrict_versions")
-    @mock.patch("cloudpub.aws.AWSProductService.wait_for_changeset")
+    @mock.patch.object(AWSProductService, "get_product_versions")
+    @mock.patch.object(AWSProductService, "set_restrict_versions")
+    @mock.patch.object(AWSProductService, "wait_for_changeset")
     def test_restrict_minor_versions_no_match(
         self,
         mock_wait_for_changeset: mock.MagicMock,
@@ -924,7 +897,7 @@ class TestAWSProductService:
 
     def test_get_product_active_changesets(
         self,
-        mock_list_change_sets: mock.MagicMock,
+        mock_list_change_sets: mock.Mock,
         aws_service: AWSProductService,
         list_changeset_response: Dict[str, Any],
     ) -> None:
@@ -945,8 +918,8 @@ class TestAWSProductService:
         assert change_sets[0].entity_id_list[0] == "d87bcebf-9cf4-47f5-9b5b-5470d4490f3d"
         assert change_sets[0].status == "APPLYING"
 
-    @mock.patch("cloudpub.aws.AWSProductService.get_product_active_changesets")
-    @mock.patch("cloudpub.aws.AWSProductService.wait_for_changeset")
+    @mock.patch.object(AWSProductService, "get_product_active_changesets")
+    @mock.patch.object(AWSProductService, "wait_for_changeset")
     def test_wait_product_active_changesets(
         self,
         mock_wait_for_changeset: mock.MagicMock,
@@ -954,17 +927,17 @@ class TestAWSProductService:
         aws_service: AWSProductService,
         list_changeset_obj: ListChangeSetsResponse,
     ) -> None:
-        aws_service.wait_for_changeset_attempts = 2
         mock_product_active_changesets.side_effect = [list_changeset_obj.change_set_list, []]
-        aws_service.wait_active_changesets("fake-entity")
+        with mock.patch.object(aws_service, "wait_for_changeset_attempts", 2):
+            aws_service.wait_active_changesets("fake-entity")
 
         mock_product_active_changesets.assert_has_calls(
             [mock.call("fake-entity"), mock.call("fake-entity")]
         )
         mock_wait_for_changeset.assert_called_once_with("2de11mwkeagfwj07225x1h5a5")
 
-    @mock.patch("cloudpub.aws.AWSProductService.get_product_active_changesets")
-    @mock.patch("cloudpub.aws.AWSProductService.wait_for_changeset")
+    @mock.patch.object(AWSProductService, "get_product_active_changesets")
+    @mock.patch.object(AWSProductService, "wait_for_changeset")
     def test_wait_product_no_active_changesets(
         self,
         mock_wait_for_changeset: mock.MagicMock,
@@ -977,8 +950,8 @@ class TestAWSProductService:
         mock_product_active_changesets.assert_called_once_with("fake-entity")
         mock_wait_for_changeset.assert_not_called()
 
-    @mock.patch("cloudpub.aws.AWSProductService.get_product_active_changesets")
-    @mock.patch("cloudpub.aws.AWSProductService.wait_for_changeset")
+    @mock.patch.object(AWSProductService, "get_product_active_changesets")
+    @mock.patch.object(AWSProductService, "wait_for_changeset")
     def test_wait_product_active_changesets_timeout(
         self,
         mock_wait_for_changeset: mock.MagicMock,
@@ -986,7 +959,7 @@ class TestAWSProductService:
         aws_service: AWSProductService,
         list_changeset_obj: ListChangeSetsResponse,
     ) -> None:
-        aws_service.wait_for_changeset_attempts = 1
         mock_product_active_changesets.return_value = list_changeset_obj.change_set_list
-        with pytest.raises(Timeout, match="Timed out waiting for fake-entity to be unlocked"):
-            aws_service.wait_active_changesets("fake-entity")
+        with mock.patch.object(aws_service, "wait_for_changeset_attempts", 1):
+            with pytest.raises(Timeout, match="Timed out waiting for fake-entity to be unlocked"):
+                aws_service.wait_active_changesets("fake-entity")
@@ -145,6 +145,23 @@ class TestAzureService:
                     in caplog.text
                 )
 
+    @mock.patch("cloudpub.ms_azure.service.json")
+    @mock.patch("cloudpub.ms_azure.AzureService._raise_for_status")
+    def test_configure_request_no_debug(
+        self,
+        mock_raise_status: mock.MagicMock,
+        mock_json: mock.MagicMock,
+        azure_service: AzureService,
+        caplog: LogCaptureFixture,
+    ) -> None:
+        res_obj = response(200, {"foo": "bar"})
+
+        with mock.patch.object(azure_service.session, 'post', return_value=res_obj):
+            with caplog.at_level(logging.WARNING, logger="cloudpub.ms_azure.service"):
+                azure_service._configure({"to": "configure"})
+
+        mock_json.dumps.assert_not_called()
+
     @mock.patch("cloudpub.ms_azure.AzureService._raise_for_status")
     def test_query_job_details(
         self,
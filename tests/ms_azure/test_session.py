@@ -1,11 +1,20 @@
 from datetime import datetime, timedelta
-from typing import Any, Dict
+from typing import Any, Dict, cast
 from unittest import mock
 
 import pytest
+import requests
 from httmock import response
+from requests.adapters import HTTPAdapter
 
-from cloudpub.ms_azure.session import AccessToken, PartnerPortalSession
+from cloudpub.error import CircuitOpenError
+from cloudpub.ms_azure.session import (
+    AccessToken,
+    CircuitBreaker,
+    JitterRetry,
+    PartnerPortalSession,
+    TimeoutAdapter,
+)
 from cloudpub.utils import join_url
 
 
@@ -23,6 +32,112 @@ class TestAccessToken:
         at.expires_on = future_time
         assert not at.is_expired()
 
+        # Check the expiration skew
+        at.expires_on = datetime.now() + timedelta(seconds=30)
+        assert at.is_expired()
+        at.skew = 0
+        assert not at.is_expired()
+
+
+class TestJitterRetry:
+    def test_backoff_without_jitter(self) -> None:
+        retry = JitterRetry(total=5, backoff_factor=1).increment().increment()
+        assert retry.get_backoff_time() == 2
+
+    @mock.patch("cloudpub.ms_azure.session.random.uniform")
+    def test_backoff_with_jitter(self, mock_uniform: mock.MagicMock) -> None:
+        mock_uniform.return_value = 0.5
+        retry = JitterRetry(total=5, backoff_factor=1, jitter=1.0)
+
+        # No jitter is added while there's no backoff
+        assert retry.get_backoff_time() == 0
+
+        # The jitter must be preserved on each new retry
+        retry = retry.increment().increment()
+        assert retry.jitter == 1.0
+        assert retry.get_backoff_time() == 2.5
+        mock_uniform.assert_called_once_with(0, 1.0)
+
+    def test_is_retry_throttled_methods(self) -> None:
+        retry = JitterRetry(total=5, status_forcelist=(429, 500), throttled_methods={"POST"})
+
+        assert retry.is_retry("POST", 429)
+        assert retry.is_retry("post", 429)
+        assert not retry.is_retry("POST", 500)
+        assert retry.is_retry("GET", 500)
+
+        # The throttled methods must be preserved on each new retry
+        retry = retry.increment()
+        assert retry.throttled_methods == frozenset({"POST"})
+
+
+class TestTimeoutAdapter:
+    @pytest.mark.parametrize("timeout,expected", [(None, 30), (10, 10)])
+    @mock.patch("cloudpub.ms_azure.session.HTTPAdapter.send")
+    def test_send(self, mock_send: mock.MagicMock, timeout: Any, expected: int) -> None:
+        request = mock.MagicMock()
+        adapter = TimeoutAdapter(timeout=30)
+
+        adapter.send(request, timeout=timeout)
+
+        mock_send.assert_called_once_with(
+            request, stream=False, timeout=expected, verify=True, cert=None, proxies=None
+        )
+
+
+class TestCircuitBreaker:
+    @mock.patch("cloudpub.ms_azure.session.time.monotonic")
+    def test_breaker(self, mock_monotonic: mock.MagicMock) -> None:
+        mock_monotonic.return_value = 100
+        breaker = CircuitBreaker(threshold=2, reset_seconds=30)
+
+        # A success resets the failure count
+        breaker.record(False)
+        breaker.record(True)
+        breaker.record(False)
+        assert breaker.allow()
+        assert breaker.state == "closed"
+
+        # Reaching the threshold opens the circuit
+        breaker.record(False)
+        assert breaker.state == "open"
+        assert not breaker.allow()
+
+        # After the reset time it lets a single probe request through
+        mock_monotonic.return_value = 130
+        assert breaker.allow()
+        assert breaker.state == "half-open"
+        assert not breaker.allow()
+
+        # A single failure while half-open opens the circuit again
+        breaker.record(False)
+        assert breaker.state == "open"
+        assert not breaker.allow()
+
+        # A success while half-open closes the circuit
+        mock_monotonic.return_value = 160
+        assert breaker.allow()
+        breaker.record(True)
+        assert breaker.state == "closed"
+        assert breaker.fail_count == 0
+
+    @mock.patch("cloudpub.ms_azure.session.time.monotonic")
+    def test_breaker_lost_probe(self, mock_monotonic: mock.MagicMock) -> None:
+        mock_monotonic.return_value = 100
+        breaker = CircuitBreaker(threshold=1, reset_seconds=30)
+        breaker.record(False)
+
+        # The probe result is never recorded
+        mock_monotonic.return_value = 130
+        assert breaker.allow()
+        mock_monotonic.return_value = 159
+        assert not breaker.allow()
+
+        # Another probe is allowed after the reset time
+        mock_monotonic.return_value = 160
+        assert breaker.allow()
+        assert breaker.state == "half-open"
+
 
 class TestPartnerPortalSession:
     def test_make_session(self, auth_dict: Dict[str, str]) -> None:
@@ -31,6 +146,40 @@ class TestPartnerPortalSession:
         assert isinstance(session, PartnerPortalSession)
         assert session.resource == "https://graph.microsoft.com"
 
+    def test_session_retries(self, auth_dict: Dict[str, str]) -> None:
+        session = PartnerPortalSession.make_graph_api_session(auth_keys=auth_dict)
+        adapter = cast(HTTPAdapter, session.session.get_adapter("https://graph.microsoft.com"))
+        retries = adapter.max_retries
+
+        assert isinstance(retries, JitterRetry)
+        assert retries.jitter == 1.0
+        assert retries.respect_retry_after_header is True
+        assert 429 in retries.status_forcelist
+        # POST must only be retried when throttled
+        assert retries.allowed_methods is not None
+        assert "POST" not in retries.allowed_methods
+        assert {"GET", "PUT", "DELETE", "HEAD"}.issubset(retries.allowed_methods)
+        assert retries.is_retry("POST", 429)
+        assert not retries.is_retry("POST", 500)
+        assert retries.is_retry("GET", 500)
+
+    def test_session_pool(self, auth_dict: Dict[str, str]) -> None:
+        session = PartnerPortalSession.make_graph_api_session(auth_keys=auth_dict)
+        adapter = session.session.get_adapter("https://graph.microsoft.com")
+
+        assert isinstance(adapter, TimeoutAdapter)
+        assert adapter.timeout == 30
+        assert adapter._pool_connections == 20
+        assert adapter._pool_maxsize == 50
+        assert adapter._pool_block is False
+        assert session.session.headers["Accept"] == "application/json"
+
+        # The login must have a dedicated pool
+        login_adapter = session.session.get_adapter("https://login.microsoftonline.com/foo")
+        assert isinstance(login_adapter, TimeoutAdapter)
+        assert login_adapter is not adapter
+        assert login_adapter._pool_maxsize == 2
+
     def test_make_session_invalid_auth_dict(self, auth_dict: Dict[str, str]) -> None:
         keys = [
             "AZURE_CLIENT_ID",
@@ -47,6 +196,14 @@ class TestPartnerPortalSession:
             with pytest.raises(ValueError, match=expected_msg):
                 PartnerPortalSession.make_graph_api_session(copyauth_dict)
 
+        # All missing keys must be reported at once
+        expected_msg = 'The key/value for "AZURE_CLIENT_ID", "AZURE_API_SECRET" must be set.'
+        copyauth_dict = auth_dict.copy()
+        del copyauth_dict["AZURE_CLIENT_ID"]
+        copyauth_dict["AZURE_API_SECRET"] = ""
+        with pytest.raises(ValueError, match=expected_msg):
+            PartnerPortalSession.make_graph_api_session(copyauth_dict)
+
     @mock.patch("cloudpub.ms_azure.session.requests.Session")
     def test_login(
         self,
@@ -59,7 +216,6 @@ class TestPartnerPortalSession:
 
         tenant = auth_dict['AZURE_TENANT_ID']
         login_url = f"https://login.microsoftonline.com/{tenant}/oauth2/token"
-        login_header = {"Accept": "application/json"}
         login_data = {
             "resource": "https://graph.microsoft.com",
             "client_id": auth_dict["AZURE_CLIENT_ID"],
@@ -70,11 +226,81 @@ class TestPartnerPortalSession:
         session = PartnerPortalSession.make_graph_api_session(auth_dict)
         session.get("/foo")
 
+        session_mock.return_value.headers.update.assert_called_once_with(
+            {"Accept": "application/json"}
+        )
         session_mock.return_value.request.assert_called_once()
         session_mock.return_value.post.assert_called_once_with(
-            login_url, headers=login_header, data=login_data, timeout=30
+            login_url, data=login_data, timeout=30
         )
 
+    @mock.patch("cloudpub.ms_azure.session.requests.Session")
+    def test_login_token_reuse(
+        self,
+        session_mock: mock.MagicMock,
+        auth_dict: Dict[str, str],
+        token: Dict[str, str],
+    ) -> None:
+        token["expires_on"] = str(int((datetime.now() + timedelta(hours=1)).timestamp()))
+        session_mock.return_value.request.return_value = response(200)
+        session_mock.return_value.post.return_value = response(200, token)
+
+        session = PartnerPortalSession.make_graph_api_session(auth_dict)
+        session.get("/foo")
+        session.get("/bar")
+
+        assert session_mock.return_value.request.call_count == 2
+        session_mock.return_value.post.assert_called_once()
+        for c in session_mock.return_value.request.call_args_list:
+            assert c.kwargs["headers"] == {"Authorization": f"Bearer {token['access_token']}"}
+
+    @mock.patch("cloudpub.ms_azure.session.requests.Session")
+    def test_request_circuit_open(
+        self,
+        session_mock: mock.MagicMock,
+        auth_dict: Dict[str, str],
+        token: Dict[str, str],
+    ) -> None:
+        session_mock.return_value.post.return_value = response(200, token)
+        session_mock.return_value.request.side_effect = [
+            response(500),
+            requests.ConnectionError("Connection refused"),
+        ]
+        session = PartnerPortalSession(
+            auth_keys=auth_dict,
+            prefix_url="https://graph.microsoft.com/rp/product-ingestion",
+            breaker_threshold=2,
+        )
+
+        assert session.get("/foo").status_code == 500
+        with pytest.raises(requests.ConnectionError):
+            session.get("/foo")
+        with pytest.raises(CircuitOpenError, match="the circuit is open"):
+            session.get("/foo")
+        assert session_mock.return_value.request.call_count == 2
+        # No login must be attempted while the circuit is open
+        assert session_mock.return_value.post.call_count == 2
+
+    @mock.patch("cloudpub.ms_azure.session.requests.Session")
+    def test_request_login_failure_keeps_circuit_closed(
+        self,
+        session_mock: mock.MagicMock,
+        auth_dict: Dict[str, str],
+        token: Dict[str, str],
+    ) -> None:
+        session_mock.return_value.post.side_effect = [response(401), response(200, token)]
+        session_mock.return_value.request.return_value = response(200)
+        session = PartnerPortalSession(
+            auth_keys=auth_dict,
+            prefix_url="https://graph.microsoft.com/rp/product-ingestion",
+            breaker_threshold=1,
+        )
+
+        with pytest.raises(requests.HTTPError):
+            session.get("/foo")
+        assert session.get("/foo").status_code == 200
+        session_mock.return_value.request.assert_called_once()
+
     @pytest.mark.parametrize(
         'method,path,json',
         [
@@ -95,10 +321,10 @@ class TestPartnerPortalSession:
     ) -> None:
         # for PartnerPortalSession._login
         mock_session.return_value.post.return_value = response(200, token)
+        mock_session.return_value.request.return_value = response(200)
 
         url = join_url("https://graph.microsoft.com/rp/product-ingestion", path)
         put_headers = {
-            'Accept': 'application/json',
             'Authorization': f'Bearer {token["access_token"]}',
         }
         put_param = {'$version': auth_dict['AZURE_SCHEMA_VERSION']}
@@ -1,9 +1,11 @@
 import logging
 from operator import attrgetter
 from typing import Any, Dict
+from unittest import mock
 
 import pytest
 from _pytest.logging import LogCaptureFixture
+from deepdiff import DeepDiff
 
 from cloudpub.models.ms_azure import (
     ConfigureStatus,
@@ -16,11 +18,16 @@ from cloudpub.models.ms_azure import (
 from cloudpub.ms_azure.utils import (
     AzurePublishingMetadata,
     create_disk_version_from_scratch,
+    create_vm_image_definitions,
     get_image_type_mapping,
     is_azure_job_not_complete,
+    is_sas_eq,
     is_sas_present,
+    logdiff,
     prepare_vm_images,
+    seek_disk_version,
     update_skus,
+    vm_images_by_generation,
 )
 
 
@@ -101,6 +108,10 @@ class TestAzureUtils:
         res = get_image_type_mapping(metadata_azure_obj.architecture, "V2")
         assert res == "x64Gen2"
 
+        # Test ARM64 which is Gen2 only
+        assert get_image_type_mapping("arm64", "V2") == "arm64Gen2"
+        assert get_image_type_mapping("arm64", "V1") == ""
+
     @pytest.mark.parametrize(
         "sas1,sas2,expected",
         [
@@ -129,6 +140,74 @@ class TestAzureUtils:
         res = is_sas_present(tech_config=technical_config_obj, sas_uri=sas2)
         assert res is expected
 
+    @pytest.mark.parametrize(
+        "sas1,sas2,expected",
+        [
+            ("https://foo.com/bar?foo=bar&st=a", "https://foo.com/bar?foo=bar&st=b", True),
+            ("https://foo.com/bar?foo=bar&st=a", "https://bar.com/foo?foo=bar&st=a", False),
+            ("https://foo.com/bar?foo=bar&bar=foo", "https://foo.com/bar?foo=bar", False),
+            ("https://foo.com/bar?foo=bar&st=a", "https://foo.com/bar?foo=foo&st=a", False),
+        ],
+    )
+    def test_is_sas_eq(self, sas1: str, sas2: str, expected: bool) -> None:
+        assert is_sas_eq(sas1, sas2) is expected
+        assert is_sas_eq(sas2, sas1) is expected
+
+    def test_is_sas_present_multiple_disk_versions(
+        self,
+        technical_config_obj: VMIPlanTechConfig,
+        disk_version_arm64_obj: DiskVersion,
+    ) -> None:
+        sas = "https://foo.com/arm64?foo=bar&st=a&se=b&sig=c"
+        disk_version_arm64_obj.vm_images[0].source.os_disk.uri = sas
+        technical_config_obj.disk_versions.append(disk_version_arm64_obj)
+
+        assert is_sas_present(technical_config_obj, "https://foo.com/arm64?foo=bar&st=d&sig=e")
+        assert not is_sas_present(technical_config_obj, "https://foo.com/arm64?foo=foo&st=a")
+
+    @pytest.mark.parametrize("reverse", [False, True])
+    def test_vm_images_by_generation(
+        self,
+        reverse: bool,
+        disk_version_obj: DiskVersion,
+        gen1_image_obj: VMImageDefinition,
+        gen2_image_obj: VMImageDefinition,
+    ) -> None:
+        if reverse:
+            disk_version_obj.vm_images.reverse()
+
+        vm_images = list(disk_version_obj.vm_images)
+
+        res = vm_images_by_generation(disk_version_obj, "x64")
+        assert res == (gen2_image_obj, gen1_image_obj)
+        # The disk version must not be changed
+        assert disk_version_obj.vm_images == vm_images
+
+    def test_vm_images_by_generation_single(
+        self, disk_version_arm64_obj: DiskVersion, arm_image_obj: VMImageDefinition
+    ) -> None:
+        res = vm_images_by_generation(disk_version_arm64_obj, "arm64")
+        assert res == (arm_image_obj, None)
+
+    @pytest.mark.parametrize(
+        "version_number,expected", [("2.0.0", 0), ("2.1.0", 1), ("3.0.0", None), (None, None)]
+    )
+    def test_seek_disk_version(
+        self,
+        version_number: Any,
+        expected: Any,
+        technical_config_obj: VMIPlanTechConfig,
+        disk_version_arm64_obj: DiskVersion,
+    ) -> None:
+        technical_config_obj.disk_versions.append(disk_version_arm64_obj)
+
+        res = seek_disk_version(technical_config_obj, version_number)
+
+        if expected is None:
+            assert res is None
+        else:
+            assert res is technical_config_obj.disk_versions[expected]
+
     def test_prepare_vm_images_gen1(
         self,
         metadata_azure_obj: AzurePublishingMetadata,
@@ -248,6 +327,33 @@ class TestAzureUtils:
         )
         assert res == expected
 
+    @pytest.mark.parametrize(
+        "generation,expected_skuid", [("V2", "plan1-arm64"), ("V1", "plan1-arm64-gen2")]
+    )
+    def test_update_new_skus_arm64_ignores_gen1(
+        self,
+        disk_version_arm64_obj: DiskVersion,
+        arm_image_obj: VMImageDefinition,
+        generation: str,
+        expected_skuid: str,
+    ) -> None:
+        """Ensure no SKU is created for an ARM64 Gen1 image as it's not supported."""
+        arm_gen1_image = VMImageDefinition.from_json(
+            {"imageType": "arm64Gen1", "source": arm_image_obj.source.to_json()}
+        )
+        disk_version_arm64_obj.vm_images.append(arm_gen1_image)
+        expected = [
+            VMISku.from_json(
+                {"imageType": "arm64Gen2", "skuId": expected_skuid, "security_type": None}
+            )
+        ]
+        res = update_skus(
+            disk_versions=[disk_version_arm64_obj],
+            generation=generation,
+            plan_name="plan1",
+        )
+        assert res == expected
+
     def test_update_new_skus_mixed_x64_arm64_gen2_default(
         self,
         disk_version_arm64_obj: DiskVersion,
@@ -484,3 +590,36 @@ class TestAzureUtils:
         res.vm_images = sorted(res.vm_images, key=attrgetter("image_type"))
 
         assert res == disk_version_arm64_obj
+
+    @pytest.mark.parametrize("support_legacy", [False, True])
+    def test_create_vm_image_definitions(
+        self,
+        support_legacy: bool,
+        gen1_image_obj: VMImageDefinition,
+        gen2_image_obj: VMImageDefinition,
+        vmimage_source_obj: VMImageSource,
+        metadata_azure_obj: AzurePublishingMetadata,
+    ) -> None:
+        metadata_azure_obj.support_legacy = support_legacy
+        expected = [gen2_image_obj, gen1_image_obj] if support_legacy else [gen2_image_obj]
+
+        res = create_vm_image_definitions(metadata=metadata_azure_obj, source=vmimage_source_obj)
+
+        assert res == expected
+        # Each image must have its own source
+        assert len({id(x.source) for x in res}) == len(res)
+
+    def test_logdiff(self, caplog: LogCaptureFixture) -> None:
+        diff = DeepDiff({"foo": "bar"}, {"foo": "baz"})
+
+        with caplog.at_level(logging.WARNING):
+            logdiff(diff)
+        assert "Found the following offer diff before publishing:" in caplog.text
+        assert diff.pretty() in caplog.text
+
+    def test_logdiff_disabled(self, caplog: LogCaptureFixture) -> None:
+        diff = mock.MagicMock()
+
+        with caplog.at_level(logging.ERROR, logger="cloudpub.ms_azure.utils"):
+            logdiff(diff)
+        diff.pretty.assert_not_called()
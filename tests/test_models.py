@@ -1,4 +1,5 @@
 import logging
+from typing import Any
 
 import pytest
 from _pytest.logging import LogCaptureFixture
@@ -32,3 +33,33 @@ def test_constant():
 
     assert a.foo == "FIXED_VALUE"
     assert a.bar == "foo"
+
+
+@define
+class BarClass(FooClass):
+    baz: str = field(metadata={"alias": "Baz"})
+
+
+def test_subclass_attributes(caplog: LogCaptureFixture) -> None:
+    test_data = {"bar": "foo", "Baz": "qux", "unknown": "value"}
+
+    # The subclass must use its own attributes even after the parent is decoded
+    assert FooClass.from_json(test_data).bar == "foo"
+    with caplog.at_level(logging.WARNING):
+        b = BarClass.from_json(test_data)
+
+    assert b.foo == "FIXED_VALUE"
+    assert b.bar == "foo"
+    assert b.baz == "qux"
+    assert "Ignoring unknown attribute unknown from BarClass." in caplog.text
+
+
+@pytest.mark.parametrize("json_list", [None, []])
+def test_from_json_list_empty(json_list: Any) -> None:
+    assert FooClass.from_json_list(json_list) == []
+
+
+def test_from_json_list() -> None:
+    res = FooClass.from_json_list([{"bar": "foo"}, {"bar": "baz"}])
+
+    assert res == [FooClass(foo="FIXED_VALUE", bar="foo"), FooClass(foo="FIXED_VALUE", bar="baz")]
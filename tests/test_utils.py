@@ -1,8 +1,8 @@
-from typing import Dict
+from typing import Dict, Tuple
 
 import pytest
 
-from cloudpub.utils import get_url_params
+from cloudpub.utils import base_url, get_url_params, join_url
 
 
 @pytest.mark.parametrize(
@@ -12,8 +12,40 @@ from cloudpub.utils import get_url_params
         ("https://foo.com/bar?foo=bar", {"foo": "bar"}),
         ("https://foo.com/bar?foo=bar", {"foo": "bar"}),
         ("https://foo.com/bar?foo=bar&test=pass", {"foo": "bar", "test": "pass"}),
+        ("https://foo.com/bar?", {}),
+        ("https://foo.com/bar?foo=bar&&test=pass", {"foo": "bar", "test": "pass"}),
+        ("https://foo.com/bar?foo=bar#fragment", {"foo": "bar"}),
+        ("https://foo.com/bar?sig=a%3D%3D&foo=", {"sig": "a%3D%3D", "foo": ""}),
     ],
 )
 def test_get_url_params(url: str, params: Dict[str, str]) -> None:
     p = get_url_params(url)
     assert p == params
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        ("https://foo.com", "https://foo.com"),
+        ("https://foo.com/bar/", "https://foo.com"),
+        ("https://foo.com:8443/bar;param?foo=bar#fragment", "https://foo.com:8443"),
+        (
+            "https://login.microsoftonline.com/{tenant}/oauth2/token",
+            "https://login.microsoftonline.com",
+        ),
+    ],
+)
+def test_base_url(url: str, expected: str) -> None:
+    assert base_url(url) == expected
+
+
+@pytest.mark.parametrize(
+    "args,expected",
+    [
+        (("https://foo.com", "bar"), "https://foo.com/bar"),
+        (("https://foo.com/", "/bar/"), "https://foo.com/bar"),
+        (("https://foo.com", "bar", "baz/"), "https://foo.com/bar/baz"),
+    ],
+)
+def test_join_url(args: Tuple[str, ...], expected: str) -> None:
+    assert join_url(*args) == expected